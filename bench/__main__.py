@@ -0,0 +1,164 @@
+"""
+Benchmarks for template resolution, loading, hashing and rendering.
+
+Generates synthetic template trees of the requested sizes and measures the
+hot paths of :mod:`score.tpl`. Run from the repository root::
+
+    python -m bench --sizes 1000 10000 --output bench.json
+
+The results are written as JSON: a list of objects, each containing the
+name of the benchmark, the number of templates in the tree, the number of
+operations and the total and per-operation duration in seconds.
+"""
+
+from score.tpl import init, Renderer
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+
+EXTENSIONS = ('tpl', 'txt', 'css', 'xml', 'tpl.xml', 'tpl.css', 'html.tpl')
+
+MIMETYPES = {
+    'tpl': 'text/plain',
+    'txt': 'text/x-text',
+    'css': 'text/css',
+    'xml': 'text/xml',
+    'html': 'text/html',
+}
+
+
+class TrivialRenderer(Renderer):
+
+    def render_string(self, string, variables, path=None):
+        return string.replace('NAME', variables.get('name', ''))
+
+
+def generate_tree(folder, size, *, rootdirs=3, depth=6, fanout=8, seed=0):
+    """
+    Creates *size* template files distributed across *rootdirs* folders
+    below *folder*. Files are nested up to *depth* levels deep and use all
+    :data:`EXTENSIONS`. Returns the list of rootdirs and the list of
+    relative template paths.
+    """
+    rng = random.Random(seed)
+    roots = [os.path.join(folder, 'root%d' % i) for i in range(rootdirs)]
+    paths = []
+    for i in range(size):
+        parts = ['d%d' % rng.randrange(fanout)
+                 for _ in range(rng.randrange(depth + 1))]
+        extension = EXTENSIONS[i % len(EXTENSIONS)]
+        path = '/'.join(parts + ['file%d.%s' % (i, extension)])
+        file = os.path.join(roots[i % rootdirs], path)
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        with open(file, 'w') as fp:
+            fp.write('Hello NAME, this is template %d\n' % i)
+        paths.append(path)
+    return roots, paths
+
+
+def configure(rootdirs, **conf):
+    conf['rootdirs'] = '\n'.join(rootdirs)
+    tpl = init(conf)
+    for extension, mimetype in MIMETYPES.items():
+        tpl.filetypes[mimetype].extensions.append(extension)
+    tpl.engines['tpl'] = TrivialRenderer
+    tpl._finalize()
+    return tpl
+
+
+def measure(name, size, func, operations):
+    start = time.perf_counter()
+    func()
+    duration = time.perf_counter() - start
+    return {
+        'benchmark': name,
+        'size': size,
+        'operations': operations,
+        'seconds': duration,
+        'per_operation': duration / operations if operations else None,
+    }
+
+
+def run(size, samples):
+    folder = tempfile.mkdtemp(prefix='score-tpl-bench-')
+    try:
+        rootdirs, paths = generate_tree(folder, size)
+        sample = random.Random(1).sample(paths, min(samples, len(paths)))
+        tpl = configure(rootdirs)
+        variables = {'name': 'World'}
+
+        def iter_paths():
+            for _ in tpl.iter_paths():
+                pass
+
+        def find_filetype():
+            for path in sample:
+                tpl._find_filetype(path)
+
+        def find_loader():
+            for path in sample:
+                tpl._find_loader(path)
+
+        def find_renderers():
+            for path in sample:
+                tpl._find_renderers(path)
+
+        def hash():
+            for path in sample:
+                tpl.hash(path)
+
+        def render():
+            for path in sample:
+                tpl.render(path, variables)
+
+        return [
+            measure('iter_paths', size, iter_paths, 1),
+            measure('find_filetype', size, find_filetype, len(sample)),
+            measure('find_loader', size, find_loader, len(sample)),
+            measure('find_renderers', size, find_renderers, len(sample)),
+            measure('hash.cold', size, hash, len(sample)),
+            measure('hash.warm', size, hash, len(sample)),
+            measure('render.cold', size, render, len(sample)),
+            measure('render.warm', size, render, len(sample)),
+        ]
+    finally:
+        shutil.rmtree(folder)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m bench', description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[1000, 10000],
+        help='number of templates to generate for each run')
+    parser.add_argument(
+        '--samples', type=int, default=1000,
+        help='number of templates to resolve, hash and render per run')
+    parser.add_argument(
+        '--output', help='file to write the JSON results to (default: stdout)')
+    args = parser.parse_args(argv)
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.time(),
+        'results': [],
+    }
+    for size in args.sizes:
+        results['results'].extend(run(size, args.samples))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -33,11 +33,20 @@ initialization yields a :class:`.Renderer` object, which is the central hub
 for rendering templates.
 """
 
-from ._init import init, ConfiguredTplModule, FileType
+from ._init import init, ConfiguredTplModule, FileType, Template
 from ._exc import TemplateNotFound
+from ._batch import RenderResult
+from ._context import RenderContext
+from ._index import TemplateIndex
+from ._shared import SharedCache
+from ._stats import StatsCollector
 from .renderer import Renderer
-from .loader import Loader, FileSystemLoader, ChainLoader, PrefixedLoader
+from .loader import (
+    Loader, FileSystemLoader, ChainLoader, ArchiveLoader, PrefixedLoader,
+    HASH_ALGORITHMS)
 
 __all__ = (
-    'init', 'ConfiguredTplModule', 'FileType', 'TemplateNotFound', 'Renderer',
-    'Loader', 'FileSystemLoader', 'ChainLoader', 'PrefixedLoader')
+    'init', 'ConfiguredTplModule', 'FileType', 'Template', 'TemplateNotFound',
+    'RenderResult', 'RenderContext', 'Renderer', 'Loader', 'FileSystemLoader',
+    'ChainLoader', 'ArchiveLoader', 'PrefixedLoader', 'TemplateIndex',
+    'SharedCache', 'StatsCollector', 'HASH_ALGORITHMS')
@@ -0,0 +1,61 @@
+# Copyright © 2015-2018 STRG.AT GmbH, Vienna, Austria
+# Copyright © 2020 Necdet Can Ateşman, Vienna, Austria
+#
+# This file is part of the The SCORE Framework.
+#
+# The SCORE Framework and all its parts are free software: you can redistribute
+# them and/or modify them under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation which is in
+# the file named COPYING.LESSER.txt.
+#
+# The SCORE Framework and all its parts are distributed without any WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. For more details see the GNU Lesser General Public
+# License.
+#
+# If you have not received a copy of the GNU Lesser General Public License see
+# http://www.gnu.org/licenses/.
+#
+# The License-Agreement realised between you as Licensee and STRG.AT GmbH as
+# Licenser including the issue of its valid conclusion and its pre- and
+# post-contractual effects is governed by the laws of Austria. Any disputes
+# concerning this License-Agreement including the issue of its valid conclusion
+# and its pre- and post-contractual effects are exclusively decided by the
+# competent court, in whose district STRG.AT GmbH has its registered seat, at
+# the discretion of STRG.AT GmbH also the competent court, in whose district
+# the Licensee has his registered seat, an establishment or assets.
+
+"""
+Command line interface of :mod:`score.tpl`. Currently provides a single
+command for building a bundle of precompiled templates::
+
+    python -m score.tpl build app.conf templates.bundle
+"""
+
+import argparse
+import sys
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m score.tpl')
+    commands = parser.add_subparsers(dest='command')
+    build = commands.add_parser(
+        'build', help='write a bundle of precompiled templates')
+    build.add_argument(
+        'config', help='the configuration file to initialize score with')
+    build.add_argument('output', help='the bundle file to write')
+    build.add_argument(
+        '-m', '--mimetype', help='only bundle templates of this mime type')
+    args = parser.parse_args(argv)
+    if args.command != 'build':
+        parser.print_help()
+        return 1
+    from score.init import init_from_file
+    tpl = init_from_file(args.config).tpl
+    count = tpl.build_bundle(args.output, args.mimetype)
+    print('Wrote %d templates to %s' % (count, args.output))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
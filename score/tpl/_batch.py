@@ -0,0 +1,116 @@
+# Copyright © 2015-2018 STRG.AT GmbH, Vienna, Austria
+# Copyright © 2020 Necdet Can Ateşman, Vienna, Austria
+#
+# This file is part of the The SCORE Framework.
+#
+# The SCORE Framework and all its parts are free software: you can redistribute
+# them and/or modify them under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation which is in
+# the file named COPYING.LESSER.txt.
+#
+# The SCORE Framework and all its parts are distributed without any WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. For more details see the GNU Lesser General Public
+# License.
+#
+# If you have not received a copy of the GNU Lesser General Public License see
+# http://www.gnu.org/licenses/.
+#
+# The License-Agreement realised between you as Licensee and STRG.AT GmbH as
+# Licenser including the issue of its valid conclusion and its pre- and
+# post-contractual effects is governed by the laws of Austria. Any disputes
+# concerning this License-Agreement including the issue of its valid conclusion
+# and its pre- and post-contractual effects are exclusively decided by the
+# competent court, in whose district STRG.AT GmbH has its registered seat, at
+# the discretion of STRG.AT GmbH also the competent court, in whose district
+# the Licensee has his registered seat, an establishment or assets.
+
+from collections import namedtuple, deque
+import concurrent.futures
+import multiprocessing
+import os
+import pickle
+
+
+RenderResult = namedtuple('RenderResult',
+                          ('index', 'path', 'content', 'error'))
+RenderResult.__doc__ = """
+The outcome of a single job passed to
+:meth:`ConfiguredTplModule.render_many`: the *index* of the job in the input
+iterable, the template *path* and either the rendered *content* or the
+*error*, that occurred while rendering the template.
+"""
+
+
+_worker_tpl = None
+
+
+def render_many(tpl, jobs, *, workers=None, ordered=True,
+                apply_postprocessors=True, factory=None):
+    if factory is not None:
+        context = multiprocessing.get_context()
+        initargs = (None, factory)
+    elif 'fork' in multiprocessing.get_all_start_methods():
+        # forked processes inherit the configured module including all
+        # engines and postprocessors registered by other modules
+        context = multiprocessing.get_context('fork')
+        initargs = (tpl, None)
+    else:
+        # a module created from its configuration alone would lack all
+        # engines and postprocessors registered by other modules
+        raise ValueError(
+            'Cannot start worker processes without os.fork(), '
+            'a factory must be provided')
+    if workers is None:
+        workers = os.cpu_count() or 1
+    executor = concurrent.futures.ProcessPoolExecutor(
+        workers, mp_context=context, initializer=_init_worker,
+        initargs=initargs)
+    # keep a limited number of jobs in flight to allow consuming huge
+    # (or even infinite) iterables
+    max_pending = workers * 4
+    pending = deque()
+    try:
+        for index, (path, variables) in enumerate(jobs):
+            pending.append(executor.submit(
+                _render_job, index, path, variables, apply_postprocessors))
+            if len(pending) >= max_pending:
+                yield from _collect(pending, ordered)
+        while pending:
+            yield from _collect(pending, ordered)
+    finally:
+        # Executor.shutdown(cancel_futures=True) requires Python 3.9
+        for future in pending:
+            future.cancel()
+        executor.shutdown()
+
+
+def _collect(pending, ordered):
+    if ordered:
+        yield pending.popleft().result()
+        return
+    done, _ = concurrent.futures.wait(
+        pending, return_when=concurrent.futures.FIRST_COMPLETED)
+    for future in done:
+        pending.remove(future)
+        yield future.result()
+
+
+def _init_worker(tpl, factory):
+    global _worker_tpl
+    if tpl is None:
+        tpl = factory()
+    _worker_tpl = tpl
+
+
+def _render_job(index, path, variables, apply_postprocessors):
+    try:
+        content = _worker_tpl.render(
+            path, variables, apply_postprocessors=apply_postprocessors)
+    except Exception as e:
+        try:
+            pickle.dumps(e)
+        except Exception:
+            e = RuntimeError('%s: %s' % (e.__class__.__name__, e))
+        return RenderResult(index, path, None, e)
+    return RenderResult(index, path, content, None)
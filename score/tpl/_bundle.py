@@ -0,0 +1,108 @@
+# Copyright © 2015-2018 STRG.AT GmbH, Vienna, Austria
+# Copyright © 2020 Necdet Can Ateşman, Vienna, Austria
+#
+# This file is part of the The SCORE Framework.
+#
+# The SCORE Framework and all its parts are free software: you can redistribute
+# them and/or modify them under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation which is in
+# the file named COPYING.LESSER.txt.
+#
+# The SCORE Framework and all its parts are distributed without any WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. For more details see the GNU Lesser General Public
+# License.
+#
+# If you have not received a copy of the GNU Lesser General Public License see
+# http://www.gnu.org/licenses/.
+#
+# The License-Agreement realised between you as Licensee and STRG.AT GmbH as
+# Licenser including the issue of its valid conclusion and its pre- and
+# post-contractual effects is governed by the laws of Austria. Any disputes
+# concerning this License-Agreement including the issue of its valid conclusion
+# and its pre- and post-contractual effects are exclusively decided by the
+# competent court, in whose district STRG.AT GmbH has its registered seat, at
+# the discretion of STRG.AT GmbH also the competent court, in whose district
+# the Licensee has his registered seat, an establishment or assets.
+
+from ._exc import TemplateNotFound
+import json
+import zipfile
+
+
+#: Version of the bundle format written by :func:`build_bundle`.
+BUNDLE_VERSION = 1
+
+
+def build_bundle(tpl, file, mimetype=None):
+    """
+    Writes a bundle of all templates of the configured module *tpl* to given
+    *file*. See :meth:`ConfiguredTplModule.build_bundle`.
+    """
+    manifest = {}
+    with zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED) as bundle:
+        for path in tpl.iter_paths(mimetype):
+            template = tpl.get(path)
+            compiled = None
+            if template._compilable:
+                compiled = tpl._compile(template, *template.loader.load(path))
+            entry = manifest[path] = {
+                'hash': tpl._dependency_hash(path, template.hash()),
+                'dependencies': sorted(tpl._dependencies.direct(path)),
+                'mimetype': template.filetype.mimetype,
+                'compiled': None,
+            }
+            if compiled is None:
+                continue
+            renderer = template.renderers[0]
+            data = renderer.serialize(compiled)
+            if data is None:
+                continue
+            name = 'compiled/%d' % len(manifest)
+            bundle.writestr(name, data)
+            entry['compiled'] = name
+            entry['renderer'] = _renderer_name(renderer)
+        bundle.writestr('manifest.json', json.dumps({
+            'version': BUNDLE_VERSION,
+            'templates': manifest,
+        }))
+    return len(manifest)
+
+
+def load_bundle(tpl, file):
+    """
+    Reads a bundle created by :func:`build_bundle` and stores all compiled
+    templates, that are still up-to-date, in the configured module *tpl*.
+    See :meth:`ConfiguredTplModule.load_bundle`.
+    """
+    loaded = 0
+    with zipfile.ZipFile(file) as bundle:
+        manifest = json.loads(bundle.read('manifest.json').decode('UTF-8'))
+        if manifest.get('version') != BUNDLE_VERSION:
+            tpl.log.warning('Ignoring bundle %s with unsupported version %s' %
+                            (file, manifest.get('version')))
+            return 0
+        for path, entry in manifest['templates'].items():
+            if not entry['compiled']:
+                continue
+            try:
+                template = tpl.get(path)
+                for dependency in entry.get('dependencies', ()):
+                    tpl.add_dependency(path, dependency)
+                hash = tpl._dependency_hash(path, template.hash())
+            except TemplateNotFound:
+                continue
+            if hash != entry['hash'] or not template._compilable:
+                continue
+            renderer = template.renderers[0]
+            if _renderer_name(renderer) != entry['renderer']:
+                continue
+            data = bundle.read(entry['compiled'])
+            compiled = renderer.deserialize(data, path=path)
+            tpl._compiled.put(path, (hash, compiled), size=len(data))
+            loaded += 1
+    return loaded
+
+
+def _renderer_name(renderer):
+    return '%s.%s' % (type(renderer).__module__, type(renderer).__qualname__)
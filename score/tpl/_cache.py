@@ -0,0 +1,139 @@
+# Copyright © 2015-2018 STRG.AT GmbH, Vienna, Austria
+# Copyright © 2020 Necdet Can Ateşman, Vienna, Austria
+#
+# This file is part of the The SCORE Framework.
+#
+# The SCORE Framework and all its parts are free software: you can redistribute
+# them and/or modify them under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation which is in
+# the file named COPYING.LESSER.txt.
+#
+# The SCORE Framework and all its parts are distributed without any WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. For more details see the GNU Lesser General Public
+# License.
+#
+# If you have not received a copy of the GNU Lesser General Public License see
+# http://www.gnu.org/licenses/.
+#
+# The License-Agreement realised between you as Licensee and STRG.AT GmbH as
+# Licenser including the issue of its valid conclusion and its pre- and
+# post-contractual effects is governed by the laws of Austria. Any disputes
+# concerning this License-Agreement including the issue of its valid conclusion
+# and its pre- and post-contractual effects are exclusively decided by the
+# competent court, in whose district STRG.AT GmbH has its registered seat, at
+# the discretion of STRG.AT GmbH also the competent court, in whose district
+# the Licensee has his registered seat, an establishment or assets.
+
+from collections import OrderedDict
+import json
+import threading
+import xxhash
+
+
+def fingerprint(value):
+    """
+    Provides a stable hash of given *value*, which may consist of nested
+    dicts with string keys, lists and tuples containing strings, numbers,
+    booleans and `None`. Raises :class:`TypeError` for all other values.
+    """
+    serialized = json.dumps(_tagged(value), separators=(',', ':'))
+    data = serialized.encode('UTF-8', 'surrogatepass')
+    return xxhash.xxh64(data).hexdigest()
+
+
+def _tagged(value):
+    """
+    Converts given *value* into a structure, that JSON can represent without
+    loss: containers become lists starting with a tag for their type, so a
+    tuple will not be serialized like a list with the same items.
+    """
+    if isinstance(value, dict):
+        if not all(type(key) is str for key in value):
+            raise TypeError('Cannot fingerprint dicts with non-str keys')
+        return ['d'] + [[key, _tagged(value[key])] for key in sorted(value)]
+    if isinstance(value, list):
+        return ['l'] + [_tagged(item) for item in value]
+    if isinstance(value, tuple):
+        return ['t'] + [_tagged(item) for item in value]
+    # subclasses, like markup strings, might be rendered differently
+    if value is None or type(value) in (str, int, float, bool):
+        return value
+    raise TypeError('Cannot fingerprint values of type %s' % (
+        type(value).__name__,))
+
+
+class LRUCache:
+    """
+    A thread-safe mapping holding at most *maxsize* entries. The least
+    recently used entry is discarded whenever a new entry would exceed this
+    limit. A *maxsize* of `None` disables the limit.
+
+    It is also possible to limit the cache to *maxbytes*, in which case every
+    entry must be stored with its approximate size in bytes.
+    """
+
+    def __init__(self, maxsize=None, *, maxbytes=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, *, size=0):
+        if self.maxsize is not None and self.maxsize <= 0:
+            return
+        if self.maxbytes is not None and size > self.maxbytes:
+            self.pop(key)
+            return
+        with self._lock:
+            self.bytes += size - self._sizes.get(key, 0)
+            self._data[key] = value
+            self._sizes[key] = size
+            self._data.move_to_end(key)
+            while (self.maxsize is not None and
+                    len(self._data) > self.maxsize) or \
+                    (self.maxbytes is not None and
+                     self.bytes > self.maxbytes):
+                evicted, _ = self._data.popitem(last=False)
+                self.bytes -= self._sizes.pop(evicted)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            self.bytes -= self._sizes.pop(key, 0)
+            return self._data.pop(key, default)
+
+    def remove_if(self, predicate):
+        """
+        Removes all entries, whose key satisfies given *predicate*.
+        """
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+                self.bytes -= self._sizes.pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.bytes = 0
@@ -0,0 +1,78 @@
+# Copyright © 2015-2018 STRG.AT GmbH, Vienna, Austria
+# Copyright © 2020 Necdet Can Ateşman, Vienna, Austria
+#
+# This file is part of the The SCORE Framework.
+#
+# The SCORE Framework and all its parts are free software: you can redistribute
+# them and/or modify them under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation which is in
+# the file named COPYING.LESSER.txt.
+#
+# The SCORE Framework and all its parts are distributed without any WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. For more details see the GNU Lesser General Public
+# License.
+#
+# If you have not received a copy of the GNU Lesser General Public License see
+# http://www.gnu.org/licenses/.
+#
+# The License-Agreement realised between you as Licensee and STRG.AT GmbH as
+# Licenser including the issue of its valid conclusion and its pre- and
+# post-contractual effects is governed by the laws of Austria. Any disputes
+# concerning this License-Agreement including the issue of its valid conclusion
+# and its pre- and post-contractual effects are exclusively decided by the
+# competent court, in whose district STRG.AT GmbH has its registered seat, at
+# the discretion of STRG.AT GmbH also the competent court, in whose district
+# the Licensee has his registered seat, an establishment or assets.
+
+from collections.abc import Mapping
+
+
+class RenderContext(Mapping):
+    """
+    A read-only mapping of the *variables* of a single rendering, layered
+    on top of the *globals* mapping of a :class:`FileType`. Neither mapping
+    is copied, lookups consult the *variables* first.
+
+    The values of globals, whose names are contained in *lazy*, are
+    callables. Such a callable is invoked when its global is first accessed
+    and its return value is kept for the lifetime of this context.
+    """
+
+    __slots__ = ('variables', 'globals', 'lazy', '_resolved')
+
+    def __init__(self, variables, globals, lazy=frozenset()):
+        self.variables = variables
+        self.globals = globals
+        self.lazy = lazy
+        self._resolved = {}
+
+    def __getitem__(self, key):
+        try:
+            return self.variables[key]
+        except KeyError:
+            pass
+        if key not in self.lazy:
+            return self.globals[key]
+        try:
+            return self._resolved[key]
+        except KeyError:
+            value = self._resolved[key] = self.globals[key]()
+            return value
+
+    def __contains__(self, key):
+        return key in self.variables or key in self.globals
+
+    def __iter__(self):
+        yield from self.variables
+        for key in self.globals:
+            if key not in self.variables:
+                yield key
+
+    def __len__(self):
+        return len(self.variables) + sum(
+            1 for key in self.globals if key not in self.variables)
+
+    def __repr__(self):
+        return '<%s variables=%r globals=%r>' % (
+            type(self).__name__, self.variables, sorted(self.globals))
@@ -0,0 +1,106 @@
+# Copyright © 2015-2018 STRG.AT GmbH, Vienna, Austria
+# Copyright © 2020 Necdet Can Ateşman, Vienna, Austria
+#
+# This file is part of the The SCORE Framework.
+#
+# The SCORE Framework and all its parts are free software: you can redistribute
+# them and/or modify them under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation which is in
+# the file named COPYING.LESSER.txt.
+#
+# The SCORE Framework and all its parts are distributed without any WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. For more details see the GNU Lesser General Public
+# License.
+#
+# If you have not received a copy of the GNU Lesser General Public License see
+# http://www.gnu.org/licenses/.
+#
+# The License-Agreement realised between you as Licensee and STRG.AT GmbH as
+# Licenser including the issue of its valid conclusion and its pre- and
+# post-contractual effects is governed by the laws of Austria. Any disputes
+# concerning this License-Agreement including the issue of its valid conclusion
+# and its pre- and post-contractual effects are exclusively decided by the
+# competent court, in whose district STRG.AT GmbH has its registered seat, at
+# the discretion of STRG.AT GmbH also the competent court, in whose district
+# the Licensee has his registered seat, an establishment or assets.
+
+from collections import defaultdict
+import threading
+
+
+class DependencyGraph:
+    """
+    Keeps track of the templates, that other templates include, extend or
+    import. Every edge is stored in both directions, so the transitive
+    :meth:`dependencies` of a template and the transitive :meth:`dependents`
+    of a changed file can be determined cheaply.
+    """
+
+    def __init__(self):
+        self._forward = defaultdict(set)
+        self._reverse = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def add(self, path, dependency):
+        """
+        Records that template *path* depends on template *dependency*.
+        """
+        if dependency == path:
+            return
+        with self._lock:
+            self._forward[path].add(dependency)
+            self._reverse[dependency].add(path)
+
+    def reset(self, path):
+        """
+        Forgets all dependencies of template *path*. Templates depending on
+        *path* are not affected.
+        """
+        with self._lock:
+            for dependency in self._forward.pop(path, ()):
+                dependents = self._reverse[dependency]
+                dependents.discard(path)
+                if not dependents:
+                    del self._reverse[dependency]
+
+    def direct(self, path):
+        """
+        Provides the templates, that *path* depends on directly.
+        """
+        with self._lock:
+            return frozenset(self._forward.get(path, ()))
+
+    def dependencies(self, path):
+        """
+        Provides all templates, that *path* depends on -- directly or
+        indirectly -- as a `set`.
+        """
+        return self._collect(self._forward, path)
+
+    def dependents(self, path):
+        """
+        Provides all templates, that depend on *path* -- directly or
+        indirectly -- as a `set`.
+        """
+        return self._collect(self._reverse, path)
+
+    def clear(self):
+        """
+        Removes all edges.
+        """
+        with self._lock:
+            self._forward.clear()
+            self._reverse.clear()
+
+    def _collect(self, edges, path):
+        result = set()
+        with self._lock:
+            pending = list(edges.get(path, ()))
+            while pending:
+                current = pending.pop()
+                if current in result or current == path:
+                    continue
+                result.add(current)
+                pending.extend(edges.get(current, ()))
+        return result
@@ -0,0 +1,235 @@
+# Copyright © 2015-2018 STRG.AT GmbH, Vienna, Austria
+# Copyright © 2020 Necdet Can Ateşman, Vienna, Austria
+#
+# This file is part of the The SCORE Framework.
+#
+# The SCORE Framework and all its parts are free software: you can redistribute
+# them and/or modify them under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation which is in
+# the file named COPYING.LESSER.txt.
+#
+# The SCORE Framework and all its parts are distributed without any WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. For more details see the GNU Lesser General Public
+# License.
+#
+# If you have not received a copy of the GNU Lesser General Public License see
+# http://www.gnu.org/licenses/.
+#
+# The License-Agreement realised between you as Licensee and STRG.AT GmbH as
+# Licenser including the issue of its valid conclusion and its pre- and
+# post-contractual effects is governed by the laws of Austria. Any disputes
+# concerning this License-Agreement including the issue of its valid conclusion
+# and its pre- and post-contractual effects are exclusively decided by the
+# competent court, in whose district STRG.AT GmbH has its registered seat, at
+# the discretion of STRG.AT GmbH also the competent court, in whose district
+# the Licensee has his registered seat, an establishment or assets.
+
+from collections import defaultdict
+import contextlib
+import json
+import os
+import tempfile
+import threading
+
+
+class DirectoryScanner:
+    """
+    Enumerates all files below the given *rootdirs* in a single pass and
+    groups them by every extension they have: a file called ``a.tpl.xml``
+    will be listed under the extensions ``tpl.xml`` and ``xml``. If a file
+    with the same relative path exists in multiple *rootdirs*, only the first
+    one is reported.
+
+    The *index* is an optional :class:`TemplateIndex` to query instead of
+    scanning the folders.
+    """
+
+    def __init__(self, rootdirs, *, index=None):
+        self.rootdirs = rootdirs
+        self.index = index
+        self._pins = 0
+        self._buckets = None
+        self._lock = threading.Lock()
+
+    def paths(self, extension):
+        """
+        Provides the list of paths with given *extension*. The folders are
+        scanned again on every invocation, unless the scanner is
+        :meth:`pinned`.
+        """
+        with self._lock:
+            buckets = self._buckets
+            if buckets is None or not self._pins:
+                buckets = self._buckets = self._scan()
+        return buckets.get(extension, [])
+
+    @contextlib.contextmanager
+    def pinned(self):
+        """
+        A context manager, that re-uses the result of a single scan for all
+        calls to :meth:`paths` until the context is exited.
+        """
+        with self._lock:
+            if not self._pins:
+                self._buckets = None
+            self._pins += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pins -= 1
+
+    def _scan(self):
+        buckets = defaultdict(list)
+        seen = set()
+        for rootdir in self.rootdirs:
+            if self.index is not None:
+                paths = (path for path, *_ in self.index.iter_files(rootdir))
+            else:
+                paths = _walk(rootdir)
+            for path in paths:
+                if path in seen:
+                    continue
+                seen.add(path)
+                filename = path.rsplit('/', 1)[-1]
+                idx = filename.find('.')
+                while idx >= 0:
+                    buckets[filename[idx + 1:]].append(path)
+                    idx = filename.find('.', idx + 1)
+        return buckets
+
+
+def _walk(rootdir):
+    # every folder is accompanied by the identities of its ancestors: a
+    # symlink pointing to one of them creates a loop, whereas all other
+    # symlinks to folders are aliases, that must be listed
+    stack = [('', frozenset())]
+    while stack:
+        reldir, ancestors = stack.pop()
+        folder = os.path.join(rootdir, reldir)
+        try:
+            stat = os.stat(folder)
+            entries = list(os.scandir(folder))
+        except OSError:
+            continue
+        identity = (stat.st_dev, stat.st_ino)
+        if identity in ancestors:
+            continue
+        ancestors = ancestors | {identity}
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    stack.append((reldir + entry.name + '/', ancestors))
+                elif entry.is_file():
+                    yield reldir + entry.name
+            except OSError:
+                pass
+
+
+class TemplateIndex:
+    """
+    A persistent index of all files below a number of root folders, stored
+    in the JSON *file*. The index remembers the modification time of every
+    folder and only lists the contents of folders, that changed since the
+    last scan. Since a folder's modification time only changes when entries
+    are added, removed or renamed, the index is suitable for enumerating
+    templates, but not for detecting changed file contents.
+    """
+
+    version = 1
+
+    def __init__(self, file):
+        self.file = file
+        self._roots = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def iter_files(self, rootdir):
+        """
+        Provides a list of 3-tuples for every file below *rootdir*, each
+        consisting of the path relative to the *rootdir*, the modification
+        time in nanoseconds and the size of the file. Folders, that changed
+        since the last invocation, are scanned again before returning.
+        """
+        rootdir = os.path.abspath(rootdir)
+        with self._lock:
+            if self._update(rootdir):
+                self._save()
+            tree = self._roots[rootdir]
+        return [(reldir + name, mtime, size)
+                for reldir, entry in tree.items()
+                for name, (mtime, size) in entry['files'].items()]
+
+    def _update(self, rootdir):
+        old = self._roots.get(rootdir, {})
+        new = {}
+        changed = False
+        # symlinks to ancestors create loops, see _walk()
+        stack = [('', frozenset())]
+        while stack:
+            reldir, ancestors = stack.pop()
+            try:
+                stat = os.stat(os.path.join(rootdir, reldir))
+            except OSError:
+                continue
+            identity = (stat.st_dev, stat.st_ino)
+            if identity in ancestors:
+                continue
+            ancestors = ancestors | {identity}
+            entry = old.get(reldir)
+            if entry is None or entry['mtime'] != stat.st_mtime_ns:
+                entry = self._scan(os.path.join(rootdir, reldir))
+                entry['mtime'] = stat.st_mtime_ns
+                changed = True
+            new[reldir] = entry
+            stack.extend((reldir + name + '/', ancestors)
+                         for name in entry['dirs'])
+        if new.keys() != old.keys():
+            changed = True
+        self._roots[rootdir] = new
+        return changed
+
+    def _scan(self, folder):
+        dirs = []
+        files = {}
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            entries = []
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    dirs.append(entry.name)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    files[entry.name] = [stat.st_mtime_ns, stat.st_size]
+            except OSError:
+                pass
+        return {'dirs': sorted(dirs), 'files': files}
+
+    def _load(self):
+        try:
+            with open(self.file) as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get('version') != self.version:
+            return
+        self._roots = data['roots']
+
+    def _save(self):
+        folder = os.path.dirname(os.path.abspath(self.file))
+        fd, tmpfile = tempfile.mkstemp(dir=folder, prefix='.tplindex-')
+        try:
+            with os.fdopen(fd, 'w') as file:
+                json.dump({'version': self.version, 'roots': self._roots},
+                          file)
+            os.replace(tmpfile, self.file)
+        except OSError:
+            # the index is just an optimization, failing to persist it must
+            # not prevent rendering templates
+            try:
+                os.unlink(tmpfile)
+            except OSError:
+                pass
@@ -26,16 +26,47 @@
 # the Licensee has his registered seat, an establishment or assets.
 
 import os
+from ._batch import render_many
+from ._bundle import build_bundle, load_bundle
 from ._exc import TemplateNotFound
-from .loader import FileSystemLoader
+from ._index import TemplateIndex, DirectoryScanner
+from ._shared import SharedCache
+from ._stats import StatsCollector, cache_stats
+from ._cache import LRUCache, fingerprint as _fingerprint
+from ._context import RenderContext
+from ._dependencies import DependencyGraph
+from .loader import (
+    Loader, FileSystemLoader, HASH_ALGORITHMS, _run_in_executor)
+from .renderer import Renderer
 from collections import namedtuple, defaultdict, OrderedDict
 from score.init import (
-    parse_list, extract_conf, ConfiguredModule, ConfigurationError)
+    parse_list, parse_bool, parse_time_interval, parse_object, extract_conf,
+    ConfiguredModule, ConfigurationError)
+import codecs
+import concurrent.futures
+import json
 import re
+import threading
+import time
+import types
+import xxhash
 
 
 defaults = {
     'rootdirs': [],
+    'check_interval': '0',
+    'cache.templates': 1000,
+    'cache.compiled': 1000,
+    'cache.compiled.bytes': 64 * 1024 * 1024,
+    'cache.output.bytes': 16 * 1024 * 1024,
+    'cache.postprocessors': 1000,
+    'cache.shared': None,
+    'bundle': None,
+    'stats': False,
+    'mmap_threshold': 1024 * 1024,
+    'hash_algorithm': 'xxh64',
+    'precompute': False,
+    'precompute.encoding': None,
 }
 
 
@@ -46,6 +77,82 @@ def init(confdict):
 
     :confkey:`rootdirs` :confdefault:`None`
         Denotes the root folder containing all templates.
+
+    :confkey:`check_interval` :confdefault:`0`
+        The time interval, after which the location of a template file is
+        looked up again in the *rootdirs*. The default value of `0` will query
+        the file system every time a template is accessed. The special value
+        ``never`` will cache all lookups indefinitely, which is the fastest
+        option for production environments, where templates do not change
+        while the application is running.
+
+    :confkey:`index_file` :confdefault:`None`
+        Path to a file, where a persistent :class:`TemplateIndex` of all
+        files in the *rootdirs* can be stored. Enumerating templates will then
+        only need to list the contents of folders, that have changed since the
+        index was last updated.
+
+    :confkey:`mmap_threshold` :confdefault:`1048576`
+        Minimum size of template files in bytes, that will be :mod:`memory
+        mapped <mmap>` when accessed through
+        :meth:`ConfiguredTplModule.render_buffer`.
+
+    :confkey:`hash_algorithm` :confdefault:`xxh64`
+        The xxHash function used for hashing templates, one of ``xxh64``,
+        ``xxh3_64`` and ``xxh3_128``. See :attr:`Loader.hash_algorithm`.
+
+    :confkey:`executor` :confdefault:`None`
+        The :class:`concurrent.futures.Executor` to use for blocking
+        operations in :meth:`ConfiguredTplModule.render_async` and the other
+        coroutines of this module. Will be passed to
+        :func:`score.init.parse_object`, if present. The default value will use
+        the default executor of the event loop.
+
+    :confkey:`cache.templates` :confdefault:`1000`
+        Maximum number of :class:`Template` objects to keep for consecutive
+        calls to :meth:`ConfiguredTplModule.render`.
+
+    :confkey:`cache.compiled` :confdefault:`1000`
+        Maximum number of compiled templates to keep in memory. See
+        :meth:`Renderer.compile`.
+
+    :confkey:`cache.compiled.bytes` :confdefault:`67108864`
+        Memory budget of the compiled template cache. The size of a compiled
+        template is approximated with the size of its source.
+
+    :confkey:`cache.output.bytes` :confdefault:`16777216`
+        Memory budget of the cache for rendered templates. Only templates
+        declared cacheable will be stored in this cache, see
+        :attr:`FileType.cacheable` and
+        :meth:`ConfiguredTplModule.mark_cacheable`.
+
+    :confkey:`cache.postprocessors` :confdefault:`1000`
+        Number of results of pure postprocessors to keep for each file type.
+        See :attr:`FileType.postprocessors`.
+
+    :confkey:`cache.shared` :confdefault:`None`
+        A folder for a :class:`SharedCache`, that allows multiple processes to
+        share template hashes and compiled templates. Renderers must implement
+        :meth:`Renderer.serialize` to participate in the latter.
+
+    :confkey:`bundle` :confdefault:`None`
+        A bundle file created with ``python -m score.tpl build``. Compiled
+        templates will be loaded from this file during :ref:`finalization
+        <finalization>`, unless the template changed since the bundle was
+        built. See :meth:`ConfiguredTplModule.build_bundle`.
+
+    :confkey:`stats` :confdefault:`False`
+        Whether timings of all rendering phases should be collected for
+        :meth:`ConfiguredTplModule.stats`.
+
+    :confkey:`precompute` :confdefault:`False`
+        Whether all templates without a template engine should be rendered
+        during :ref:`finalization <finalization>`. See
+        :meth:`ConfiguredTplModule.precompute`.
+
+    :confkey:`precompute.encoding` :confdefault:`None`
+        An optional encoding to provide the precomputed templates in. See
+        :meth:`ConfiguredTplModule.precomputed`.
     """
     conf = dict(defaults.items())
     conf['rootdirs'] = []
@@ -62,7 +169,39 @@ def init(confdict):
             import score.tpl
             raise ConfigurationError(
                 score.tpl, 'Given rootdir is not a folder: %s' % (rootdir,))
-    tpl = ConfiguredTplModule(rootdirs)
+    if conf['check_interval'] in (None, 'never'):
+        check_interval = None
+    else:
+        check_interval = parse_time_interval(conf['check_interval'])
+    index = None
+    if conf.get('index_file'):
+        index = TemplateIndex(conf['index_file'])
+    shared_cache = None
+    if conf['cache.shared']:
+        shared_cache = SharedCache(conf['cache.shared'])
+    if conf['hash_algorithm'] not in HASH_ALGORITHMS:
+        import score.tpl
+        raise ConfigurationError(
+            score.tpl, 'Unsupported hash_algorithm: %s' % (
+                conf['hash_algorithm'],))
+    executor = None
+    if conf.get('executor'):
+        executor = parse_object(conf, 'executor')
+    tpl = ConfiguredTplModule(
+        rootdirs, check_interval=check_interval, index=index,
+        mmap_threshold=int(conf['mmap_threshold']),
+        shared_cache=shared_cache, executor=executor,
+        hash_algorithm=conf['hash_algorithm'],
+        template_cache_size=int(conf['cache.templates']),
+        compiled_cache_size=int(conf['cache.compiled']),
+        compiled_cache_bytes=int(conf['cache.compiled.bytes']),
+        output_cache_bytes=int(conf['cache.output.bytes']),
+        postprocessor_cache_size=int(conf['cache.postprocessors']))
+    if parse_bool(conf['stats']):
+        tpl.add_listener(StatsCollector())
+    tpl._bundle = conf['bundle']
+    tpl._precompute = parse_bool(conf['precompute'])
+    tpl._precompute_encoding = conf['precompute.encoding']
     extensions = set()
     for key in extract_conf(conf, 'filetype.'):
         extensions.add(key.rsplit('.', 1)[0])
@@ -73,6 +212,9 @@ def init(confdict):
             raise ConfigurationError(
                 score.tpl, 'No mimetype configured for extension %s' % (ext,))
         tpl.filetypes[mimetype].extensions.append(ext)
+        encoding = conf.get('filetype.%s.encoding' % ext)
+        if encoding:
+            tpl.filetypes[mimetype].encoding = encoding
     return tpl
 
 
@@ -82,16 +224,105 @@ class ConfiguredTplModule(ConfiguredModule):
     <score.init.ConfiguredModule>`.
     """
 
-    def __init__(self, rootdirs):
+    def __init__(self, rootdirs, *, check_interval=0, index=None,
+                 mmap_threshold=1024 * 1024, shared_cache=None,
+                 executor=None, hash_algorithm='xxh64',
+                 template_cache_size=1000,
+                 compiled_cache_size=1000, compiled_cache_bytes=None,
+                 output_cache_bytes=None, postprocessor_cache_size=1000):
         super().__init__(__package__)
         self.rootdirs = rootdirs
+        self.check_interval = check_interval
+        self.index = index
+        self.mmap_threshold = mmap_threshold
+        self.shared_cache = shared_cache
+        self.hash_algorithm = hash_algorithm
+        self.postprocessor_cache_size = postprocessor_cache_size
+        self._scanner = DirectoryScanner(rootdirs, index=index)
+        self.executor = executor
         self.filetypes = FileTypes(self)
         self.loaders = Loaders(self)
         self.engines = Engines(self)
         self._renderers = defaultdict(dict)
+        self._renderers_lock = threading.Lock()
+        self._templates = LRUCache(template_cache_size)
+        self._compiled = LRUCache(
+            compiled_cache_size, maxbytes=compiled_cache_bytes)
+        self._output = LRUCache(maxbytes=output_cache_bytes)
+        self._cacheable = {}
+        self._bundle = None
+        self._precompute = False
+        self._precompute_encoding = None
+        self._precomputed = {}
+        self._listeners = []
+        self._dependencies = DependencyGraph()
+        # template hashes, for which the dependencies of templates, that
+        # cannot be compiled, were recorded during rendering
+        self._rendered_hashes = {}
 
-    def define_global(self, mimetype, name, value, escape=True):
-        self.filetypes[mimetype].add_global(name, value, escape=escape)
+    def add_listener(self, listener):
+        """
+        Registers a callback, that will receive the duration of every phase of
+        :meth:`render`, :meth:`load` and :meth:`hash`. The *listener* is
+        invoked with three arguments: the template path, the name of the
+        phase and the duration in seconds. The phases are:
+
+        - ``resolve``: determining the :class:`Template` of a path,
+        - ``load``: loading the template via its :class:`Loader`,
+        - ``compile``: looking up or creating the compiled template,
+        - ``renderer:<name>``: the renderer with given class name,
+        - ``read``: reading the file of a template without renderers,
+        - ``postprocessor:<name>``: the postprocessor with given name,
+        - ``render``: the whole rendering process,
+        - ``hash``: determining the hash of a template.
+
+        Timings are only measured, while at least one listener is registered.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Removes a *listener* previously registered with :meth:`add_listener`.
+        """
+        self._listeners.remove(listener)
+
+    def stats(self):
+        """
+        Provides a snapshot of this module's statistics as a `dict`. The key
+        'caches' contains the hits, misses and hit ratio of all caches. If a
+        :class:`StatsCollector` was registered as listener -- by enabling the
+        :confkey:`stats` configuration -- its :meth:`StatsCollector.snapshot`
+        is included as well.
+        """
+        hashes = [loader.hash_cache
+                  for loaders in self.loaders.values()
+                  for loader in loaders
+                  if isinstance(loader, Loader)]
+        result = {
+            'caches': {
+                'templates': cache_stats(self._templates),
+                'compiled': cache_stats(self._compiled),
+                'output': cache_stats(self._output),
+                'hashes': cache_stats(_CacheCounters(hashes)),
+                'postprocessors': {
+                    mimetype: cache_stats(filetype.postprocessor_cache)
+                    for mimetype, filetype in self.filetypes.items()},
+            },
+        }
+        for listener in self._listeners:
+            if isinstance(listener, StatsCollector):
+                result.update(listener.snapshot())
+                break
+        return result
+
+    def _notify(self, path, phase, duration):
+        for listener in self._listeners:
+            listener(path, phase, duration)
+
+    def define_global(self, mimetype, name, value, escape=True, *,
+                      lazy=False):
+        self.filetypes[mimetype].add_global(
+            name, value, escape=escape, lazy=lazy)
 
     def iter_paths(self, mimetype=None):
         """
@@ -100,10 +331,16 @@ class ConfiguredTplModule(ConfiguredModule):
         type will pe provided instead.
         """
         def all_paths():
-            for mimetype in self.filetypes:
-                for extension in self.filetypes[mimetype].extensions:
-                    for loader in self.loaders[extension]:
-                        yield from loader.iter_paths()
+            found = set()
+            # all FileSystemLoaders share the result of a single scan
+            with self._scanner.pinned():
+                for mimetype in self.filetypes:
+                    for extension in self.filetypes[mimetype].extensions:
+                        for loader in self.loaders[extension]:
+                            for path in loader.iter_paths():
+                                if path not in found:
+                                    found.add(path)
+                                    yield path
 
         def valid_paths():
             for path in all_paths():
@@ -129,7 +366,45 @@ class ConfiguredTplModule(ConfiguredModule):
 
         See :meth:`Loader.load`.
         """
-        return self._find_loader(path).load(path)
+        if not self._listeners:
+            return self._find_loader(path).load(path)
+        start = time.perf_counter()
+        result = self._find_loader(path).load(path)
+        self._notify(path, 'load', time.perf_counter() - start)
+        return result
+
+    async def load_async(self, path):
+        """
+        Coroutine variant of :meth:`load`.
+
+        See :meth:`Loader.load_async`.
+        """
+        loader = await self._run_in_executor(self._find_loader, path)
+        return await _load_async(loader, path, self.executor)
+
+    def get(self, path):
+        """
+        Provides the :class:`Template` for given *path*. The returned object
+        can be used to render the template any number of times without
+        resolving its loader, file type and renderers again.
+        """
+        return self._resolve(path)[0]
+
+    def _resolve(self, path):
+        """
+        Provides the :class:`Template` for given *path* like :meth:`get`,
+        and whether it was memoized.
+        """
+        template = self._templates.get(path)
+        if template is not None:
+            return template, True
+        filetype = self._find_filetype(path)
+        template = Template(
+            self, path, filetype, self._find_loader(path),
+            self._find_renderers(path, filetype=filetype),
+            self._cacheable.get(path))
+        self._templates.put(path, template)
+        return template, False
 
     def render(self, path, variables=None, *, apply_postprocessors=True):
         """
@@ -137,23 +412,428 @@ class ConfiguredTplModule(ConfiguredModule):
         It is possible to prevent running the file type's postprocessors by
         passing a falsy value for the *apply_postprocessors* parameter.
         """
-        filetype = self._find_filetype(path)
-        is_file, result = self.load(path)
-        if variables is None:
-            variables = {}
-        for renderer in self._find_renderers(path, filetype=filetype):
-            if is_file:
-                result = renderer.render_file(result, variables, path=path)
-                is_file = False
-            else:
-                result = renderer.render_string(result, variables, path=path)
-        if is_file:
-            result = open(result).read()
-        if apply_postprocessors:
-            for postprocessor in filetype.postprocessors:
-                result = postprocessor(result)
+        if apply_postprocessors and path in self._precomputed:
+            return self._precomputed[path][0]
+        if self._listeners:
+            return self._render_timed(path, variables, apply_postprocessors)
+        return self._with_template(path, lambda template: template.render(
+            variables, apply_postprocessors=apply_postprocessors))
+
+    def render_bytes(self, path, variables=None, *,
+                     apply_postprocessors=True):
+        """
+        Renders given template *path* like :meth:`render`, but provides the
+        result as `bytes` in the :attr:`encoding <FileType.encoding>` of its
+        file type. Renderers and postprocessors may produce encoded content
+        directly, see :meth:`Renderer.render_string_bytes` and
+        :attr:`FileType.postprocessors`. Cached and precomputed results are
+        stored encoded, so they are returned without transcoding.
+        """
+        if apply_postprocessors and path in self._precomputed:
+            return self._precomputed[path][1]
+        if self._listeners:
+            return self._render_timed(
+                path, variables, apply_postprocessors, encoded=True)
+        return self._with_template(
+            path, lambda template: template.render_bytes(
+                variables, apply_postprocessors=apply_postprocessors))
+
+    def _with_template(self, path, function):
+        """
+        Invokes *function* with the :class:`Template` of given *path* and
+        returns its result. A memoized template is resolved anew once, if
+        it raises a :class:`TemplateNotFound`.
+        """
+        while True:
+            template, memoized = self._resolve(path)
+            try:
+                return function(template)
+            except TemplateNotFound:
+                # the loader of a memoized template might no longer provide
+                # it, while another loader still does
+                self._templates.pop(path)
+                if not memoized:
+                    raise
+
+    def _render_timed(self, path, variables, apply_postprocessors, *,
+                      encoded=False):
+        start = time.perf_counter()
+
+        def render(template):
+            self._notify(path, 'resolve', time.perf_counter() - start)
+            method = template.render_bytes if encoded else template.render
+            return method(
+                variables, apply_postprocessors=apply_postprocessors)
+
+        result = self._with_template(path, render)
+        self._notify(path, 'render', time.perf_counter() - start)
         return result
 
+    def render_conditional(self, path, variables=None, *, if_none_match=None,
+                           fingerprint=None, apply_postprocessors=True):
+        """
+        Renders given template *path* like :meth:`render`, unless the client
+        already has the current result. Returns a 2-tuple consisting of an
+        ETag_ and the rendered content, which is `None`, if the ETag matches
+        the value of the *if_none_match* parameter. The latter accepts the
+        raw value of an If-None-Match header.
+
+        The ETag is derived from the template's :meth:`dependency_hash` and
+        a *fingerprint* of the *variables*, without invoking any renderers or
+        postprocessors. The *fingerprint* should be a `str`, that changes
+        whenever the relevant variables change. It is calculated from the
+        *variables* themselves, if omitted. The ETag will be `None` -- and
+        the template will always be rendered -- if the *variables* cannot be
+        fingerprinted reliably, as explained in :meth:`mark_cacheable`.
+
+        Templates are compiled first, since their dependencies are only known
+        afterwards. Templates with renderers, that cannot compile them, are
+        always rendered and never considered matching, until they have been
+        rendered in their current version once.
+
+        Note that the ETag does not cover changes to globals and
+        postprocessors.
+
+        .. _ETag: https://tools.ietf.org/html/rfc7232#section-2.3
+        """
+        if fingerprint is None:
+            try:
+                fingerprint = _fingerprint(variables or {})
+            except TypeError:
+                return None, self.render(
+                    path, variables, apply_postprocessors=apply_postprocessors)
+        def resolve(template):
+            own_hash = template.hash()
+            recorded = not template.renderers
+            if template._compilable:
+                compiled = self._compile(
+                    template, *template.loader.load(path))
+                recorded = compiled is not None
+            return own_hash, recorded
+
+        own_hash, recorded = self._with_template(path, resolve)
+
+        def etag():
+            hash = self._dependency_hash(path, own_hash)
+            return '"%s"' % xxhash.xxh64(('%s\0%s\0%d' % (
+                hash, fingerprint, bool(apply_postprocessors))).encode(
+                    'UTF-8', 'surrogatepass')).hexdigest()
+
+        if not recorded and self._rendered_hashes.get(path) != own_hash:
+            content = self.render(
+                path, variables, apply_postprocessors=apply_postprocessors)
+            self._rendered_hashes[path] = own_hash
+            return etag(), content
+        current = etag()
+        if if_none_match is not None and _etag_matches(current, if_none_match):
+            return current, None
+        content = self.render(
+            path, variables, apply_postprocessors=apply_postprocessors)
+        if not recorded:
+            # rendering may have recorded different dependencies
+            current = etag()
+        return current, content
+
+    def render_buffer(self, path, variables=None, *,
+                      apply_postprocessors=True):
+        """
+        Renders given template *path* like :meth:`render_bytes`, but provides
+        the result as a bytes-like object. The content of templates without
+        renderers and postprocessors is passed on as provided by
+        :meth:`Loader.load_buffer`, which may be a :class:`memoryview` of a
+        memory mapped file. Precomputed templates are served from memory.
+        """
+        if apply_postprocessors and path in self._precomputed:
+            return self._precomputed[path][1]
+        def render(template):
+            # Loader.load_buffer() encodes template contents as UTF-8
+            if not template.renderers and \
+                    (not apply_postprocessors or
+                     not template.postprocessors) and \
+                    codecs.lookup(template.filetype.encoding).name == 'utf-8':
+                return _load_buffer(template.loader, path)
+            return template.render_bytes(
+                variables, apply_postprocessors=apply_postprocessors)
+
+        return self._with_template(path, render)
+
+    def warmup(self, mimetype=None, *, workers=None):
+        """
+        Prepares all templates for rendering: Every path of
+        :meth:`iter_paths` is resolved to its :class:`Template`, which also
+        creates all required :class:`Renderers <Renderer>`. The templates are
+        then loaded, hashed and compiled, if their renderer supports it. The
+        work is distributed among a pool of *workers* threads.
+
+        Calling this function in the master process of a pre-forking server
+        allows all worker processes to share the prepared data.
+
+        The optional *mimetype* restricts the preparation to templates of the
+        given mime type. Returns the number of templates, that were prepared
+        successfully. Failures are logged and do not abort the process.
+        """
+        def prepare(path):
+            try:
+                template = self.get(path)
+                template.hash()
+                if template._compilable:
+                    self._compile(template, *template.loader.load(path))
+                return True
+            except Exception:
+                self.log.exception('Could not prepare template %s' % (path,))
+                return False
+
+        paths = list(self.iter_paths(mimetype))
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            return sum(executor.map(prepare, paths))
+
+    def build_bundle(self, file, mimetype=None):
+        """
+        Writes a bundle of all templates -- or all templates of given
+        *mimetype* -- to *file*. The bundle contains a manifest with the
+        :meth:`dependency_hash` of every template and the serialized compiled
+        form of all templates, whose renderer supports
+        :meth:`Renderer.serialize`. Returns the number of templates in the
+        bundle.
+
+        This function is also available on the command line::
+
+            python -m score.tpl build app.conf templates.bundle
+        """
+        return build_bundle(self, file, mimetype)
+
+    def load_bundle(self, file):
+        """
+        Loads the compiled templates of a bundle created by
+        :meth:`build_bundle`. Templates, that were modified after the bundle
+        was created, are skipped and will be compiled on demand as usual.
+        Returns the number of compiled templates loaded.
+        """
+        return load_bundle(self, file)
+
+    def add_dependency(self, path, dependency):
+        """
+        Records that the template *path* includes, extends or imports the
+        template *dependency*. :class:`Renderers <Renderer>` report these
+        relations via :meth:`Renderer.add_dependency`, while compiling or
+        rendering *path*. The dependencies of a template are forgotten
+        whenever it is compiled anew.
+        """
+        self._dependencies.add(path, dependency)
+
+    def dependencies(self, path):
+        """
+        Provides the `set` of all templates, that the template *path* depends
+        on -- directly or indirectly -- as far as they were reported via
+        :meth:`add_dependency`.
+        """
+        return self._dependencies.dependencies(path)
+
+    def dependents(self, path):
+        """
+        Provides the `set` of all templates depending on the template *path*,
+        i.e. the templates affected by a modification of *path*.
+        """
+        return self._dependencies.dependents(path)
+
+    def dependency_hash(self, path):
+        """
+        Like :meth:`hash`, but also covers all :meth:`dependencies` of the
+        template *path*. The value changes, whenever the template or any of
+        the templates it includes, extends or imports are modified. Equals
+        the value of :meth:`hash` for templates without dependencies.
+        """
+        return self._dependency_hash(path, self.hash(path))
+
+    def _dependency_hash(self, path, hash):
+        dependencies = self._dependencies.dependencies(path)
+        if not dependencies:
+            return hash
+        hasher = xxhash.xxh64()
+        hasher.update(('%s\0%s\0' % (path, hash)).encode(
+            'UTF-8', 'surrogatepass'))
+        for dependency in sorted(dependencies):
+            try:
+                dependency_hash = self.hash(dependency)
+            except TemplateNotFound:
+                dependency_hash = ''
+            hasher.update(('%s\0%s\0' % (dependency, dependency_hash)).encode(
+                'UTF-8', 'surrogatepass'))
+        return hasher.hexdigest()
+
+    def mark_cacheable(self, path, cacheable=True, *, ttl=None):
+        """
+        Declares whether the output of the template *path* may be cached,
+        overriding the settings of its :class:`FileType`. The optional *ttl*
+        is the maximum age of a cached result in seconds.
+
+        Results are cached per template hash and fingerprint of the
+        *variables* passed to :meth:`render` and its variants. Renderings
+        with variables, that cannot be fingerprinted reliably -- i.e. values
+        other than dicts with string keys, lists, tuples, strings, numbers,
+        booleans and `None` -- are never cached.
+        """
+        self._cacheable[path] = (cacheable, ttl)
+        self._templates.pop(path)
+        self.invalidate(path)
+
+    def invalidate(self, path=None):
+        """
+        Removes all cached data of given template *path* and of all its
+        :meth:`dependents`, or of all templates, if no *path* is given. This
+        includes the results of :meth:`precompute`.
+        """
+        if path is None:
+            self._output.clear()
+            self._compiled.clear()
+            self._precomputed.clear()
+            self._rendered_hashes.clear()
+            return
+        paths = self._dependencies.dependents(path)
+        paths.add(path)
+        self._output.remove_if(lambda key: key[0] in paths)
+        for dependent in paths:
+            self._compiled.pop(dependent)
+            self._precomputed.pop(dependent, None)
+            self._rendered_hashes.pop(dependent, None)
+
+    def precompute(self, mimetype=None, *, encoding=None):
+        """
+        Renders all templates, that do not need a template engine, and keeps
+        the results in memory. Consecutive calls to :meth:`render` and its
+        variants will just look up the stored result for these templates,
+        without accessing the file system. This also means, that changes to
+        these files will go unnoticed until :meth:`invalidate` is called.
+
+        The results are also stored in the :attr:`encoding
+        <FileType.encoding>` of their file type for :meth:`render_bytes`.
+
+        The optional *mimetype* restricts this operation to templates of the
+        given mime type. If an *encoding* is given, the results are also
+        stored in that encoding, which can be retrieved via
+        :meth:`precomputed`. Templates, that cannot be rendered, are logged
+        and skipped.
+        """
+        for path in list(self.iter_paths(mimetype)):
+            try:
+                template = self.get(path)
+                if template.renderers:
+                    continue
+                text = template.render(cache=False)
+                data = text.encode(template.filetype.encoding)
+                exported = None
+                if encoding:
+                    exported = text.encode(encoding)
+            except Exception:
+                self.log.exception('Could not precompute template %s' % (
+                    path,))
+                continue
+            if exported == data:
+                exported = data
+            self._precomputed[path] = (text, data, exported)
+
+    def precomputed(self, path):
+        """
+        Provides the result of :meth:`precompute` for given *path*: the
+        encoded `bytes`, if an encoding was passed to :meth:`precompute`, the
+        rendered `str` otherwise. Returns `None` if the template was not
+        precomputed.
+        """
+        try:
+            text, data, exported = self._precomputed[path]
+        except KeyError:
+            return None
+        return text if exported is None else exported
+
+    async def render_async(self, path, variables=None, *,
+                           apply_postprocessors=True):
+        """
+        Coroutine variant of :meth:`render`. All blocking operations of
+        loaders and renderers without native support for :mod:`asyncio` are
+        performed in the configured :confkey:`executor`.
+        """
+        if apply_postprocessors and path in self._precomputed:
+            return self._precomputed[path][0]
+        while True:
+            template = self._templates.get(path)
+            memoized = template is not None
+            if not memoized:
+                template = await self._run_in_executor(self.get, path)
+            try:
+                return await template.render_async(
+                    variables, apply_postprocessors=apply_postprocessors)
+            except TemplateNotFound:
+                # see _with_template()
+                self._templates.pop(path)
+                if not memoized:
+                    raise
+
+    def render_many(self, jobs, *, workers=None, ordered=True,
+                    apply_postprocessors=True, factory=None):
+        """
+        Renders many templates in a pool of *workers* processes. The *jobs*
+        must be an iterable of 2-tuples containing the template path and the
+        *variables* to render it with. The number of *workers* defaults to the
+        number of CPUs.
+
+        Returns a generator yielding a :class:`RenderResult` for each job. The
+        results are provided in the order of the *jobs*, unless the parameter
+        *ordered* is falsy, in which case they are yielded as soon as they
+        become available. Errors are reported in the result of the failing
+        job and do not abort the other jobs.
+
+        Each worker process keeps its own copy of this module, including all
+        renderers and caches. On platforms supporting :func:`os.fork`, the
+        workers inherit this very object. Alternatively, a picklable
+        *factory* can be provided, which must return a finalized configured
+        module -- including all engines and postprocessors -- when invoked
+        without arguments in a worker process. A :class:`ValueError` is
+        raised, if neither is possible.
+        """
+        return render_many(
+            self, jobs, workers=workers, ordered=ordered,
+            apply_postprocessors=apply_postprocessors, factory=factory)
+
+    def render_iter(self, path, variables=None, *,
+                    apply_postprocessors=True):
+        """
+        Renders given template *path* like :meth:`render`, but provides a
+        generator yielding the result in chunks. Renderers and postprocessors
+        supporting streaming will pass their output on as it is produced,
+        whereas all others will receive and produce the whole content at once.
+
+        See :meth:`Renderer.iter_string` and :attr:`FileType.postprocessors`.
+        """
+        if apply_postprocessors and path in self._precomputed:
+            yield self._precomputed[path][0]
+            return
+        while True:
+            template, memoized = self._resolve(path)
+            started = False
+            try:
+                for chunk in template.render_iter(
+                        variables, apply_postprocessors=apply_postprocessors):
+                    started = True
+                    yield chunk
+                return
+            except TemplateNotFound:
+                # see _with_template(), but without repeating output
+                self._templates.pop(path)
+                if not memoized or started:
+                    raise
+
+    def render_to(self, path, variables, fileobj, *,
+                  apply_postprocessors=True):
+        """
+        Renders given template *path* and writes the result to the given
+        file-like object *fileobj* as it is being produced.
+
+        See :meth:`render_iter`.
+        """
+        for chunk in self.render_iter(
+                path, variables, apply_postprocessors=apply_postprocessors):
+            fileobj.write(chunk)
+
     def mimetype(self, path):
         """
         Provides to mime type associated with given *path*.
@@ -168,7 +848,157 @@ class ConfiguredTplModule(ConfiguredModule):
 
         See :meth:`Loader.hash`.
         """
-        return self._find_loader(path).hash(path)
+        if not self._listeners:
+            return self._find_loader(path).hash(path)
+        start = time.perf_counter()
+        result = self._find_loader(path).hash(path)
+        self._notify(path, 'hash', time.perf_counter() - start)
+        return result
+
+    def hash_many(self, paths=None, *, workers=None):
+        """
+        Determines the :meth:`hash` of all given *paths* -- or of all paths of
+        :meth:`iter_paths`, if *paths* is `None` -- on a pool of *workers*
+        threads. Returns a `dict` mapping each path to its hash.
+        """
+        if paths is None:
+            paths = self.iter_paths()
+        paths = list(paths)
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            return dict(zip(paths, executor.map(self.hash, paths)))
+
+    async def hash_async(self, path):
+        """
+        Coroutine variant of :meth:`hash`.
+
+        See :meth:`Loader.hash_async`.
+        """
+        loader = await self._run_in_executor(self._find_loader, path)
+        if isinstance(loader, Loader):
+            return await loader.hash_async(path, executor=self.executor)
+        return await self._run_in_executor(loader.hash, path)
+
+    async def _run_in_executor(self, func, *args, **kwargs):
+        return await _run_in_executor(self.executor, func, *args, **kwargs)
+
+    def _render_cached(self, template, variables, apply_postprocessors, *,
+                       encoded=False):
+        """
+        Renders given *template* using the output cache. Results of
+        :meth:`Template.render_bytes` are requested and cached, if *encoded*
+        is truthy.
+        """
+        method = template.render_bytes if encoded else template.render
+        key = self._output_key(
+            template, variables, apply_postprocessors, encoded)
+        if key is None:
+            return method(
+                variables, apply_postprocessors=apply_postprocessors,
+                cache=False)
+        result = self._output_get(key)
+        if result is None:
+            result = method(
+                variables, apply_postprocessors=apply_postprocessors,
+                cache=False)
+            self._output_put(template, key, result)
+        return result
+
+    def _output_key(self, template, variables, apply_postprocessors,
+                    encoded=False):
+        """
+        Provides the key of a rendering in the output cache, or `None` if
+        the *variables* cannot be fingerprinted.
+        """
+        try:
+            fingerprint = _fingerprint(variables or {})
+        except TypeError:
+            return None
+        hash = self._dependency_hash(template.path, template.hash())
+        return (template.path, hash, fingerprint, bool(apply_postprocessors),
+                bool(encoded))
+
+    def _output_get(self, key):
+        cached = self._output.get(key)
+        if cached is not None and \
+                (cached[0] is None or cached[0] > time.monotonic()):
+            return cached[1]
+        return None
+
+    def _output_put(self, template, key, result):
+        expires = None
+        if template.cache_ttl is not None:
+            expires = time.monotonic() + template.cache_ttl
+        self._output.put(key, (expires, result), size=len(result))
+
+    def _compile(self, template, is_file, source):
+        """
+        Provides the compiled form of given *template*, as created by its
+        first renderer, or `None` if that renderer cannot compile templates.
+        The compiled objects are cached using the template's path and
+        :meth:`dependency hash <dependency_hash>`, and are also stored in the
+        :confkey:`shared cache <cache.shared>`, if the renderer can serialize
+        them.
+        """
+        path = template.path
+        renderer = template.renderers[0]
+        own_hash = template.hash()
+        hash = self._dependency_hash(path, own_hash)
+        cached = self._compiled.get(path)
+        if cached is not None and cached[0] == hash:
+            return cached[1]
+        if self.shared_cache is not None:
+            shared_key = '%s\0%s\0%s.%s\0%s' % (
+                path, own_hash, type(renderer).__module__,
+                type(renderer).__qualname__, template.filetype.mimetype)
+            compiled = self._load_shared(renderer, path, own_hash, shared_key)
+            if compiled is not None:
+                return compiled
+        if is_file:
+            source = _read_file(source, template.filetype.encoding)
+        # the renderer reports the current dependencies while compiling
+        self._dependencies.reset(path)
+        compiled = renderer.compile(source, path=path)
+        if compiled is None:
+            self._compiled.pop(path)
+            return None
+        hash = self._dependency_hash(path, own_hash)
+        self._compiled.put(path, (hash, compiled), size=len(source))
+        if self.shared_cache is not None:
+            data = renderer.serialize(compiled)
+            if data is not None:
+                # the entry starts with a line containing the dependencies
+                header = json.dumps({
+                    'dependencies': sorted(self._dependencies.direct(path)),
+                    'hash': hash,
+                })
+                self.shared_cache.put(
+                    'compiled', shared_key,
+                    header.encode('UTF-8') + b'\n' + data)
+        return compiled
+
+    def _load_shared(self, renderer, path, own_hash, shared_key):
+        """
+        Provides the compiled template *path* from the :confkey:`shared cache
+        <cache.shared>`, or `None`, if it is missing or any of its
+        dependencies changed since it was stored.
+        """
+        data = self.shared_cache.get('compiled', shared_key)
+        if data is None:
+            return None
+        try:
+            header, data = bytes(data).split(b'\n', 1)
+            dependencies = json.loads(header.decode('UTF-8'))
+        except ValueError:
+            return None
+        self._dependencies.reset(path)
+        for dependency in dependencies['dependencies']:
+            self._dependencies.add(path, dependency)
+        hash = self._dependency_hash(path, own_hash)
+        if hash != dependencies['hash']:
+            return None
+        compiled = renderer.deserialize(data, path=path)
+        self._compiled.put(path, (hash, compiled), size=len(data))
+        return compiled
 
     def _finalize(self):
         # make sure that every file extension is associated with
@@ -207,6 +1037,12 @@ class ConfiguredTplModule(ConfiguredModule):
         self.engines = OrderedDict(
             (ext, self.engines[ext])
             for ext in sorted(self.engines, key=len, reverse=True))
+        for filetype in self.filetypes.values():
+            filetype._prepare_globals()
+        if self._bundle:
+            self.load_bundle(self._bundle)
+        if self._precompute:
+            self.precompute(encoding=self._precompute_encoding)
 
     def _find_loader(self, path):
         parts = os.path.basename(path).split('.', maxsplit=1)
@@ -246,7 +1082,10 @@ class ConfiguredTplModule(ConfiguredModule):
                 reverse=True)[0]
             filename = filename[:len(extension) + 1]
             if filetype not in self._renderers[engine]:
-                self._renderers[engine][filetype] = engine(self, filetype)
+                with self._renderers_lock:
+                    if filetype not in self._renderers[engine]:
+                        self._renderers[engine][filetype] = \
+                            engine(self, filetype)
             renderers.append(self._renderers[engine][filetype])
         return renderers
 
@@ -264,6 +1103,350 @@ class ConfiguredTplModule(ConfiguredModule):
         raise TemplateNotFound(path)
 
 
+class Template:
+    """
+    A template *path*, that was resolved to its :class:`FileType`, its
+    :class:`Loader` and the list of :class:`Renderers <Renderer>` to apply.
+    Instances are created via :meth:`ConfiguredTplModule.get`.
+    """
+
+    def __init__(self, conf, path, filetype, loader, renderers,
+                 cacheable=None):
+        self._conf = conf
+        self.path = path
+        self.filetype = filetype
+        self.loader = loader
+        self.renderers = tuple(renderers)
+        self.postprocessors = tuple(
+            _PurePostprocessor(postprocessor, filetype.postprocessor_cache)
+            if getattr(postprocessor, 'pure', False) and
+            not getattr(postprocessor, 'streaming', False)
+            else postprocessor
+            for postprocessor in filetype.postprocessors)
+        if cacheable is None:
+            cacheable = (filetype.cacheable, filetype.cache_ttl)
+        self.cacheable, self.cache_ttl = cacheable
+        self._compilable = bool(self.renderers) and \
+            isinstance(self.renderers[0], Renderer) and \
+            type(self.renderers[0]).compile is not Renderer.compile
+
+    def render(self, variables=None, *, apply_postprocessors=True,
+               cache=True):
+        """
+        Renders this template with the optional `dict` of *variables*. The
+        output cache is consulted for :attr:`cacheable` templates, unless
+        *cache* is falsy.
+
+        See :meth:`ConfiguredTplModule.render`.
+        """
+        if cache and self.cacheable:
+            return self._conf._render_cached(
+                self, variables, apply_postprocessors)
+        result = self._render(variables, stream=False)
+        if apply_postprocessors:
+            result = self._postprocess(result)
+        return result
+
+    def render_bytes(self, variables=None, *, apply_postprocessors=True,
+                     cache=True):
+        """
+        Renders this template like :meth:`render`, but provides the result as
+        `bytes` in the :attr:`encoding <FileType.encoding>` of its file type.
+
+        See :meth:`ConfiguredTplModule.render_bytes`.
+        """
+        if cache and self.cacheable:
+            return self._conf._render_cached(
+                self, variables, apply_postprocessors, encoded=True)
+        result = self._render(variables, stream=False, encoded=True)
+        if apply_postprocessors:
+            result = self._postprocess(result, encoded=True)
+        return result
+
+    async def render_async(self, variables=None, *,
+                           apply_postprocessors=True, cache=True):
+        """
+        Coroutine variant of :meth:`render`.
+
+        See :meth:`ConfiguredTplModule.render_async`.
+        """
+        if cache and self.cacheable:
+            conf = self._conf
+            key = await _run_in_executor(
+                conf.executor, conf._output_key, self, variables,
+                apply_postprocessors)
+            if key is not None:
+                result = conf._output_get(key)
+                if result is None:
+                    result = await self.render_async(
+                        variables, apply_postprocessors=apply_postprocessors,
+                        cache=False)
+                    conf._output_put(self, key, result)
+                return result
+        executor = self._conf.executor
+        is_file, result = await _load_async(self.loader, self.path, executor)
+        if variables is None:
+            variables = {}
+        compiled = None
+        if self._compilable:
+            compiled = await _run_in_executor(
+                executor, self._conf._compile, self, is_file, result)
+        for renderer in self.renderers:
+            if compiled is not None:
+                result = renderer.render_compiled(
+                    compiled, variables, path=self.path)
+                compiled = None
+            elif isinstance(renderer, Renderer):
+                method = renderer.render_file_async if is_file \
+                    else renderer.render_string_async
+                result = await method(
+                    result, variables, path=self.path, executor=executor)
+            elif is_file:
+                result = await _run_in_executor(
+                    executor, renderer.render_file, result, variables,
+                    path=self.path)
+            else:
+                result = renderer.render_string(
+                    result, variables, path=self.path)
+            is_file = False
+        if is_file:
+            result = await _run_in_executor(
+                executor, _read_file, result, self.filetype.encoding)
+        if apply_postprocessors:
+            result = self._postprocess(result)
+        return result
+
+    def render_iter(self, variables=None, *, apply_postprocessors=True,
+                    cache=True):
+        """
+        Renders this template like :meth:`render`, but provides a generator
+        yielding the result in chunks. The output of :attr:`cacheable`
+        templates is stored in the output cache, once all chunks were
+        consumed.
+
+        See :meth:`ConfiguredTplModule.render_iter`.
+        """
+        if cache and self.cacheable:
+            conf = self._conf
+            key = conf._output_key(self, variables, apply_postprocessors)
+            if key is not None:
+                result = conf._output_get(key)
+                if result is not None:
+                    yield result
+                    return
+                chunks = []
+                for chunk in self.render_iter(
+                        variables, apply_postprocessors=apply_postprocessors,
+                        cache=False):
+                    chunks.append(chunk)
+                    yield chunk
+                conf._output_put(self, key, ''.join(chunks))
+                return
+        chunks = self._render(variables, stream=True)
+        if apply_postprocessors:
+            for postprocessor in self.postprocessors:
+                if getattr(postprocessor, 'streaming', False) and \
+                        not getattr(postprocessor, 'bytes', False):
+                    chunks = postprocessor(chunks)
+                else:
+                    result = self._apply(postprocessor, ''.join(chunks))
+                    if not isinstance(result, str):
+                        result = result.decode(self.filetype.encoding)
+                    chunks = (result,)
+        yield from chunks
+
+    def _render(self, variables, *, stream, encoded=False):
+        """
+        Loads and renders this template without applying postprocessors. The
+        return value is an iterable of chunks if *stream* is truthy, `bytes`
+        if *encoded* is truthy, and a `str` otherwise.
+        """
+        timed = bool(self._conf._listeners)
+        if timed:
+            start = time.perf_counter()
+        is_file, result = self.loader.load(self.path)
+        if timed:
+            start = self._timed('load', start)
+        if variables is None:
+            variables = {}
+        compiled = None
+        if self._compilable:
+            compiled = self._conf._compile(self, is_file, result)
+            if timed:
+                start = self._timed('compile', start)
+        streamed = False
+        for i, renderer in enumerate(self.renderers):
+            # only the last renderer may stream or encode its output, all
+            # others must provide a string for the next renderer in the chain
+            last = i == len(self.renderers) - 1 and \
+                isinstance(renderer, Renderer)
+            streamed = stream and last
+            encode = encoded and last
+            if compiled is not None:
+                method = renderer.iter_compiled if streamed \
+                    else renderer.render_compiled_bytes if encode \
+                    else renderer.render_compiled
+                result = method(compiled, variables, path=self.path)
+                compiled = None
+            elif is_file:
+                method = renderer.iter_file if streamed \
+                    else renderer.render_file_bytes if encode \
+                    else renderer.render_file
+                result = method(result, variables, path=self.path)
+            else:
+                method = renderer.iter_string if streamed \
+                    else renderer.render_string_bytes if encode \
+                    else renderer.render_string
+                result = method(result, variables, path=self.path)
+            is_file = False
+            if timed and not streamed:
+                start = self._timed(
+                    'renderer:%s' % type(renderer).__name__, start)
+        if is_file:
+            # files without renderers are stored in the file type's encoding
+            if stream:
+                return _iter_file(result, self.filetype.encoding)
+            result = _read_bytes(result) if encoded \
+                else _read_file(result, self.filetype.encoding)
+            if timed:
+                self._timed('read', start)
+            return result
+        if stream and not streamed:
+            return (result,)
+        if encoded and isinstance(result, str):
+            result = result.encode(self.filetype.encoding)
+        return result
+
+    def _postprocess(self, result, *, encoded=False):
+        """
+        Applies all postprocessors to given *result* and provides the outcome
+        as `bytes`, if *encoded* is truthy, or as `str` otherwise.
+        """
+        timed = bool(self._conf._listeners)
+        if timed:
+            start = time.perf_counter()
+        for postprocessor in self.postprocessors:
+            result = self._apply(postprocessor, result)
+            if timed:
+                start = self._timed('postprocessor:%s' % getattr(
+                    postprocessor, '__name__', type(postprocessor).__name__),
+                    start)
+        if encoded and isinstance(result, str):
+            result = result.encode(self.filetype.encoding)
+        elif not encoded and not isinstance(result, str):
+            result = result.decode(self.filetype.encoding)
+        return result
+
+    def _apply(self, postprocessor, content):
+        """
+        Passes *content* to a single *postprocessor*, after converting it to
+        `bytes` or `str`, depending on what the postprocessor operates on.
+        The return value is the unaltered result of the postprocessor.
+        """
+        if getattr(postprocessor, 'bytes', False):
+            if isinstance(content, str):
+                content = content.encode(self.filetype.encoding)
+        elif not isinstance(content, str):
+            content = content.decode(self.filetype.encoding)
+        if getattr(postprocessor, 'streaming', False):
+            return content[:0].join(postprocessor((content,)))
+        return postprocessor(content)
+
+    def _timed(self, phase, start):
+        """
+        Reports the time elapsed since *start* for given *phase* and returns
+        the current time.
+        """
+        now = time.perf_counter()
+        self._conf._notify(self.path, phase, now - start)
+        return now
+
+    def hash(self):
+        """
+        Provides a hash of this template's content.
+
+        See :meth:`Loader.hash`.
+        """
+        return self.loader.hash(self.path)
+
+
+def _etag_matches(etag, if_none_match):
+    """
+    Whether *etag* is contained in the value of an If-None-Match header.
+    """
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate in ('*', etag):
+            return True
+    return False
+
+
+class _CacheCounters:
+    """
+    Sums up the hits and misses of multiple caches.
+    """
+
+    def __init__(self, caches):
+        self.hits = sum(cache.hits for cache in caches)
+        self.misses = sum(cache.misses for cache in caches)
+
+
+class _PurePostprocessor:
+    """
+    Wrapper around a pure *postprocessor*, that stores its results in given
+    *cache* using the xxHash of the input.
+    """
+
+    def __init__(self, postprocessor, cache):
+        self.postprocessor = postprocessor
+        self.cache = cache
+        self.__name__ = getattr(
+            postprocessor, '__name__', type(postprocessor).__name__)
+        self.bytes = getattr(postprocessor, 'bytes', False)
+
+    def __call__(self, content):
+        if isinstance(content, str):
+            digest = xxhash.xxh64(
+                content.encode('UTF-8', 'surrogatepass')).hexdigest()
+        else:
+            digest = xxhash.xxh64(content).hexdigest()
+        key = (self.postprocessor, digest)
+        result = self.cache.get(key)
+        if result is None:
+            result = self.postprocessor(content)
+            self.cache.put(key, result)
+        return result
+
+
+async def _load_async(loader, path, executor):
+    if isinstance(loader, Loader):
+        return await loader.load_async(path, executor=executor)
+    return await _run_in_executor(executor, loader.load, path)
+
+
+def _load_buffer(loader, path):
+    if isinstance(loader, Loader):
+        return loader.load_buffer(path)
+    return Loader.load_buffer(loader, path)
+
+
+def _read_file(file, encoding=None):
+    with open(file, encoding=encoding) as fp:
+        return fp.read()
+
+
+def _read_bytes(file):
+    with open(file, 'rb') as fp:
+        return fp.read()
+
+
+def _iter_file(file, encoding=None, chunk_size=65536):
+    with open(file, encoding=encoding) as fp:
+        yield from iter(lambda: fp.read(chunk_size), '')
+
+
 class Loaders(defaultdict):
 
     def __init__(self, conf):
@@ -275,7 +1458,13 @@ class Loaders(defaultdict):
             raise ValueError('Invalid File extension "%s"' % (key,))
         loaders = list()
         if self.conf.rootdirs:
-            loaders.append(FileSystemLoader(self.conf.rootdirs, key))
+            loaders.append(FileSystemLoader(
+                self.conf.rootdirs, key,
+                check_interval=self.conf.check_interval,
+                scanner=self.conf._scanner,
+                mmap_threshold=self.conf.mmap_threshold,
+                shared_cache=self.conf.shared_cache,
+                hash_algorithm=self.conf.hash_algorithm))
         self[key] = loaders
         return loaders
 
@@ -320,14 +1509,21 @@ class FileType:
         self.__extensions = []
         self.__postprocessors = []
         self.__globals = []
+        self.__lazy_globals = []
         self.__finalized = False
         self.__escape = None
+        self.__cacheable = False
+        self.__cache_ttl = None
+        self.__encoding = 'UTF-8'
+        self.__global_mapping = None
+        self.__postprocessor_cache = LRUCache(conf.postprocessor_cache_size)
 
     def _finalize(self):
         # TODO: check for duplicates in extensions
         self.__extensions = tuple(self.__extensions)
         self.__postprocessors = tuple(self.__postprocessors)
         self.__globals = tuple(self.__globals)
+        self.__lazy_globals = tuple(self.__lazy_globals)
         self.__finalized = True
 
     @property
@@ -352,6 +1548,10 @@ class FileType:
         assert not self.__finalized
         self.__postprocessors = value
 
+    @property
+    def postprocessor_cache(self):
+        return self.__postprocessor_cache
+
     @property
     def escape(self):
         return self.__escape
@@ -361,19 +1561,88 @@ class FileType:
         assert not self.__finalized
         self.__escape = callback
 
+    @property
+    def cacheable(self):
+        return self.__cacheable
+
+    @cacheable.setter
+    def cacheable(self, value):
+        assert not self.__finalized
+        self.__cacheable = value
+
+    @property
+    def cache_ttl(self):
+        return self.__cache_ttl
+
+    @cache_ttl.setter
+    def cache_ttl(self, value):
+        assert not self.__finalized
+        self.__cache_ttl = value
+
+    @property
+    def encoding(self):
+        return self.__encoding
+
+    @encoding.setter
+    def encoding(self, value):
+        assert not self.__finalized
+        self.__encoding = value
+
     @property
     def globals(self):
         return self.__globals
 
-    def add_global(self, name, value, *, escape=True):
+    @property
+    def global_mapping(self):
+        return self._prepare_globals()[0]
+
+    def add_global(self, name, value, *, escape=True, lazy=False):
         """
         Defines a new global variable with given *name* and *value* for this
         file type. The optional parameter *escape* determines, whether the
         value must be escaped in the final output.
+
+        If *lazy* is truthy, the *value* must be a callable without
+        arguments, that provides the actual value of the global. It will only
+        be invoked if a template accesses the global through a
+        :meth:`context`, and at most once per context. Lazy globals are not
+        part of :attr:`globals`.
         """
         assert not self.__finalized
-        assert not any(x for x in self.__globals if x.name == name)
-        self.__globals.append(VariableDefinition(name, value, escape))
+        assert not any(x for x in self.__globals + self.__lazy_globals
+                       if x.name == name)
+        assert not lazy or callable(value)
+        if lazy:
+            self.__lazy_globals.append(VariableDefinition(name, value, escape))
+        else:
+            self.__globals.append(VariableDefinition(name, value, escape))
+        self.__global_mapping = None
+
+    def context(self, variables=None):
+        """
+        Provides a read-only :class:`RenderContext` containing the
+        *variables* of a rendering as well as all :attr:`globals` of this file
+        type. Renderers should create one context per rendering and use it
+        instead of merging the globals into the *variables*.
+        """
+        mapping, lazy = self._prepare_globals()
+        if variables is None:
+            variables = {}
+        return RenderContext(variables, mapping, lazy)
+
+    def _prepare_globals(self):
+        """
+        Builds the read-only :attr:`global_mapping` and the set of the names
+        of lazy globals, which are re-used until another global is added.
+        """
+        prepared = self.__global_mapping
+        if prepared is None:
+            definitions = tuple(self.__globals) + tuple(self.__lazy_globals)
+            prepared = self.__global_mapping = (
+                types.MappingProxyType(
+                    {var.name: var.value for var in definitions}),
+                frozenset(var.name for var in self.__lazy_globals))
+        return prepared
 
 
 VariableDefinition = namedtuple('VariableDefinition',
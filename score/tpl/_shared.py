@@ -0,0 +1,117 @@
+# Copyright © 2015-2018 STRG.AT GmbH, Vienna, Austria
+# Copyright © 2020 Necdet Can Ateşman, Vienna, Austria
+#
+# This file is part of the The SCORE Framework.
+#
+# The SCORE Framework and all its parts are free software: you can redistribute
+# them and/or modify them under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation which is in
+# the file named COPYING.LESSER.txt.
+#
+# The SCORE Framework and all its parts are distributed without any WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. For more details see the GNU Lesser General Public
+# License.
+#
+# If you have not received a copy of the GNU Lesser General Public License see
+# http://www.gnu.org/licenses/.
+#
+# The License-Agreement realised between you as Licensee and STRG.AT GmbH as
+# Licenser including the issue of its valid conclusion and its pre- and
+# post-contractual effects is governed by the laws of Austria. Any disputes
+# concerning this License-Agreement including the issue of its valid conclusion
+# and its pre- and post-contractual effects are exclusively decided by the
+# competent court, in whose district STRG.AT GmbH has its registered seat, at
+# the discretion of STRG.AT GmbH also the competent court, in whose district
+# the Licensee has his registered seat, an establishment or assets.
+
+import mmap
+import os
+import struct
+import tempfile
+import xxhash
+
+
+class SharedCache:
+    """
+    A cache storing `bytes` values in a *folder*, that can be shared among
+    multiple processes. Every entry is a separate file, which is written
+    atomically and read through a memory mapping, so all processes on a host
+    share the operating system's page cache for the stored data.
+
+    Writers never lock: an entry is written to a temporary file and then
+    moved to its final location. Keys should contain a hash of the data
+    they were derived from -- a template's :meth:`Loader.hash`, for example
+    -- so outdated entries are never found. Such stale entries can be
+    removed with :meth:`clear`.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(folder, exist_ok=True)
+
+    def get(self, namespace, key):
+        """
+        Provides the value stored for *key* in given *namespace*, or `None`.
+        """
+        key = key.encode('UTF-8', 'surrogatepass')
+        try:
+            with open(self._file(namespace, key), 'rb') as file:
+                with mmap.mmap(file.fileno(), 0,
+                               access=mmap.ACCESS_READ) as data:
+                    keylen, = struct.unpack_from('!I', data)
+                    # the file name is just a hash of the key, so we need to
+                    # verify the stored key
+                    if data[4:4 + keylen] != key:
+                        self.misses += 1
+                        return None
+                    self.hits += 1
+                    return data[4 + keylen:]
+        except (OSError, ValueError, struct.error):
+            self.misses += 1
+            return None
+
+    def put(self, namespace, key, value):
+        """
+        Stores the `bytes` *value* for *key* in given *namespace*.
+        """
+        key = key.encode('UTF-8', 'surrogatepass')
+        file = self._file(namespace, key)
+        folder = os.path.dirname(file)
+        try:
+            os.makedirs(folder, exist_ok=True)
+            fd, tmpfile = tempfile.mkstemp(dir=folder, prefix='.tmp-')
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(struct.pack('!I', len(key)))
+                fp.write(key)
+                fp.write(value)
+            os.replace(tmpfile, file)
+        except OSError:
+            try:
+                os.unlink(tmpfile)
+            except OSError:
+                pass
+
+    def clear(self, namespace=None):
+        """
+        Removes all entries of given *namespace*, or all entries, if no
+        *namespace* is given.
+        """
+        namespaces = [namespace] if namespace else os.listdir(self.folder)
+        for namespace in namespaces:
+            folder = os.path.join(self.folder, namespace)
+            for base, dirs, files in os.walk(folder):
+                for file in files:
+                    try:
+                        os.unlink(os.path.join(base, file))
+                    except OSError:
+                        pass
+
+    def _file(self, namespace, key):
+        digest = xxhash.xxh64(key).hexdigest()
+        return os.path.join(self.folder, namespace, digest[:2], digest[2:])
@@ -0,0 +1,100 @@
+# Copyright © 2015-2018 STRG.AT GmbH, Vienna, Austria
+# Copyright © 2020 Necdet Can Ateşman, Vienna, Austria
+#
+# This file is part of the The SCORE Framework.
+#
+# The SCORE Framework and all its parts are free software: you can redistribute
+# them and/or modify them under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation which is in
+# the file named COPYING.LESSER.txt.
+#
+# The SCORE Framework and all its parts are distributed without any WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. For more details see the GNU Lesser General Public
+# License.
+#
+# If you have not received a copy of the GNU Lesser General Public License see
+# http://www.gnu.org/licenses/.
+#
+# The License-Agreement realised between you as Licensee and STRG.AT GmbH as
+# Licenser including the issue of its valid conclusion and its pre- and
+# post-contractual effects is governed by the laws of Austria. Any disputes
+# concerning this License-Agreement including the issue of its valid conclusion
+# and its pre- and post-contractual effects are exclusively decided by the
+# competent court, in whose district STRG.AT GmbH has its registered seat, at
+# the discretion of STRG.AT GmbH also the competent court, in whose district
+# the Licensee has his registered seat, an establishment or assets.
+
+from collections import defaultdict, deque
+import threading
+
+
+class StatsCollector:
+    """
+    A listener for :meth:`ConfiguredTplModule.add_listener`, that aggregates
+    the reported timings per phase and per template. The percentiles are
+    computed from the most recent *samples* measurements of each phase.
+    """
+
+    def __init__(self, samples=1000):
+        self.samples = samples
+        self._phases = defaultdict(self._new_entry)
+        self._templates = defaultdict(self._new_entry)
+        self._lock = threading.Lock()
+
+    def __call__(self, path, phase, duration):
+        with self._lock:
+            self._add(self._phases[phase], duration)
+            if phase == 'render':
+                self._add(self._templates[path], duration)
+
+    def snapshot(self):
+        """
+        Provides a `dict` with two keys, 'phases' and 'templates', each
+        containing a mapping of names to their respective timings: the
+        number of measurements ('count'), the cumulative time ('total') and
+        the percentiles 'p50', 'p90' and 'p99'. All values are in seconds.
+        The 'templates' mapping only contains the timings of whole
+        renderings.
+        """
+        with self._lock:
+            return {
+                'phases': {name: self._summarize(entry)
+                           for name, entry in self._phases.items()},
+                'templates': {path: self._summarize(entry)
+                              for path, entry in self._templates.items()},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._phases.clear()
+            self._templates.clear()
+
+    def _new_entry(self):
+        return [0, 0.0, deque(maxlen=self.samples)]
+
+    def _add(self, entry, duration):
+        entry[0] += 1
+        entry[1] += duration
+        entry[2].append(duration)
+
+    def _summarize(self, entry):
+        count, total, samples = entry
+        samples = sorted(samples)
+        result = {'count': count, 'total': total}
+        for percentile in (50, 90, 99):
+            idx = min(len(samples) - 1, len(samples) * percentile // 100)
+            result['p%d' % percentile] = samples[idx]
+        return result
+
+
+def cache_stats(cache):
+    """
+    Provides the hits, misses and hit ratio of given cache.
+    """
+    lookups = cache.hits + cache.misses
+    return {
+        'hits': cache.hits,
+        'misses': cache.misses,
+        'ratio': cache.hits / lookups if lookups else None,
+    }
@@ -26,9 +26,22 @@
 # the Licensee has his registered seat, an establishment or assets.
 
 from ._exc import TemplateNotFound
+from ._cache import LRUCache
+from ._index import DirectoryScanner
 import abc
+import asyncio
+import functools
+import mmap
 import os
+import tarfile
+import threading
+import time
 import xxhash
+import zipfile
+
+
+#: Names of the xxHash_ functions available for :attr:`Loader.hash_algorithm`.
+HASH_ALGORITHMS = ('xxh64', 'xxh3_64', 'xxh3_128')
 
 
 class Loader:
@@ -64,72 +77,218 @@ class Loader:
         """
         pass
 
+    #: Number of seconds the result of :meth:`path_index` may be re-used.
+    index_interval = 1
+
+    def path_index(self):
+        """
+        Provides a set of all valid paths of this loader, or `None` if the
+        loader cannot provide such a set efficiently. The default
+        implementation collects the paths of :meth:`iter_paths` and re-uses
+        the result for :attr:`index_interval` seconds. It returns `None` for
+        loaders overriding :meth:`is_valid`, since these are often unable or
+        not meant to enumerate their paths.
+        """
+        if type(self).is_valid is not Loader.is_valid:
+            return None
+        now = time.monotonic()
+        try:
+            created, index = self._path_index
+            if now - created < self.index_interval:
+                return index
+        except AttributeError:
+            pass
+        index = frozenset(self.iter_paths())
+        self._path_index = (now, index)
+        return index
+
     def is_valid(self, path):
         """
         Whether given *path* is valid for this loader, i.e. whether a call to
-        :meth:`load` would return successfully.
+        :meth:`load` would return successfully. The default implementation
+        looks the *path* up in the :meth:`path_index`.
+        """
+        return path in self.path_index()
+
+    def load_buffer(self, path):
+        """
+        Provides the raw content of given *path* as a bytes-like object. The
+        default implementation reads the file returned by :meth:`load`, or
+        encodes the returned string as UTF-8.
+        """
+        is_file, result = self.load(path)
+        if is_file:
+            try:
+                with open(result, 'rb') as file:
+                    return file.read()
+            except FileNotFoundError:
+                raise TemplateNotFound(path)
+        if isinstance(result, str):
+            result = result.encode('UTF-8')
+        return result
+
+    async def load_async(self, path, *, executor=None):
+        """
+        Coroutine variant of :meth:`load`. Loaders with a native asynchronous
+        implementation should override this method, the default
+        implementation runs :meth:`load` in the given :class:`executor
+        <concurrent.futures.Executor>`, or the event loop's default executor,
+        if *executor* is `None`.
+        """
+        return await _run_in_executor(executor, self.load, path)
+
+    async def hash_async(self, path, *, executor=None):
         """
-        return path in self.iter_paths()
+        Coroutine variant of :meth:`hash`, running :meth:`hash` in given
+        *executor* by default.
+        """
+        return await _run_in_executor(executor, self.hash, path)
+
+    #: Maximum number of entries in the :attr:`hash_cache`.
+    hash_cache_size = 10000
+
+    #: An optional :class:`SharedCache` for sharing the hashes of files among
+    #: multiple processes.
+    shared_cache = None
+
+    #: The xxHash_ function used by :meth:`hash`, one of
+    #: :data:`HASH_ALGORITHMS`.
+    hash_algorithm = 'xxh64'
+
+    @property
+    def hash_cache(self):
+        """
+        The cache of hashes computed by :meth:`hash`. Its attributes *hits*
+        and *misses* count the lookups, that could or could not be answered
+        from the cache.
+        """
+        try:
+            return self._hash_cache
+        except AttributeError:
+            self._hash_cache = LRUCache(self.hash_cache_size)
+            return self._hash_cache
 
     def hash(self, path):
         """
         Provides a random `str`, that will always change whenever the file
-        content changes. The default implementation uses the content's xxHash_.
+        content changes. The default implementation uses the content's xxHash_
+        as determined by :attr:`hash_algorithm`. Files are hashed through a
+        :mod:`memory mapping <mmap>`.
+
+        Hashes of files are cached until the file's inode, size or
+        modification time change, so consecutive calls only need to
+        :func:`stat <os.stat>` the file. Hashes of template contents are
+        cached per path, as long as :meth:`load` keeps returning the very
+        same content object.
 
         .. _xxHash: http://cyan4973.github.io/xxHash/
         """
         is_file, result = self.load(path)
         if is_file:
             try:
-                hash = xxhash.xxh64()
-                with open(result, 'rb') as file:
-                    for chunk in iter(lambda: file.read(4096), b""):
-                        hash.update(chunk)
-                return hash.hexdigest()
+                stat = os.stat(result)
             except FileNotFoundError:
                 raise TemplateNotFound(path)
+            key = (result, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            digest = self.hash_cache.get(key)
+            if digest is not None:
+                return digest
+            if self.shared_cache is not None:
+                shared_key = '%s\0%s\0%d\0%d\0%d' % (
+                    (self.hash_algorithm,) + key)
+                digest = self.shared_cache.get('hash', shared_key)
+                if digest is not None:
+                    digest = digest.decode('ASCII')
+                    self.hash_cache.put(key, digest)
+                    return digest
+            try:
+                digest = self._hash_file(result)
+            except FileNotFoundError:
+                raise TemplateNotFound(path)
+            self.hash_cache.put(key, digest)
+            if self.shared_cache is not None:
+                self.shared_cache.put(
+                    'hash', shared_key, digest.encode('ASCII'))
+            return digest
         else:
-            if isinstance(result, str):
-                result = result.encode('ASCII')
-            return xxhash.xxh64(result).hexdigest()
+            # the cached entry holds a reference to the content, so its
+            # identity cannot be re-used by another object
+            key = ('content', path)
+            cached = self.hash_cache.get(key)
+            if cached is not None and cached[0] is result and \
+                    cached[1] == self.hash_algorithm:
+                return cached[2]
+            content = result
+            if isinstance(content, str):
+                content = content.encode('UTF-8', 'surrogatepass')
+            digest = self._hash_bytes(content)
+            self.hash_cache.put(key, (result, self.hash_algorithm, digest))
+            return digest
+
+    def _hash_bytes(self, data):
+        return getattr(xxhash, self.hash_algorithm)(data).hexdigest()
+
+    def _hash_file(self, file):
+        with open(file, 'rb') as fp:
+            # empty files cannot be mapped
+            if not os.fstat(fp.fileno()).st_size:
+                return self._hash_bytes(b'')
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return self._hash_bytes(data)
 
 
 class FileSystemLoader(Loader):
     """
     :class:`Loader` searching for files with a given *extension* inside given
     folders.
+
+    Resolved paths -- and paths that could not be found -- are remembered for
+    *check_interval* seconds before the file system is consulted again. The
+    default value of `0` checks the file system on every lookup, whereas
+    `None` will trust the cached resolution forever.
+
+    The optional *index* is a :class:`TemplateIndex`, that will be used to
+    enumerate the templates in :meth:`iter_paths` without walking all
+    folders. Loaders for different extensions may also share a *scanner*,
+    which will then walk the *rootdirs* once for all of them.
+
+    Files of at least *mmap_threshold* bytes are :mod:`memory mapped <mmap>`
+    by :meth:`load_buffer` instead of being read into memory. Note that
+    modifying such a file in place -- instead of replacing it -- while it is
+    mapped might affect previously returned buffers.
+
+    The *hash_algorithm* is one of :data:`HASH_ALGORITHMS` and determines the
+    function used by :meth:`hash <Loader.hash>`.
     """
 
-    def __init__(self, rootdirs, extension):
+    def __init__(self, rootdirs, extension, *, check_interval=0,
+                 cache_size=10000, index=None, scanner=None,
+                 mmap_threshold=1024 * 1024, shared_cache=None,
+                 hash_algorithm='xxh64'):
         if isinstance(rootdirs, str):
             rootdirs = [rootdirs]
         self.rootdirs = rootdirs
         self.extension = extension
+        self.check_interval = check_interval
+        if scanner is None:
+            scanner = DirectoryScanner(rootdirs, index=index)
+        self.scanner = scanner
+        self.mmap_threshold = mmap_threshold
+        self.shared_cache = shared_cache
+        self.hash_algorithm = hash_algorithm
+        self._resolved = LRUCache(cache_size)
+        self._mmaps = LRUCache(128)
 
     def is_valid(self, path):
         return bool(self._find_file(path))
 
+    def path_index(self):
+        # enumerating all files is far more expensive than looking up
+        # individual paths with _find_file()
+        return None
+
     def iter_paths(self):
-        if not self.rootdirs:
-            return
-        found = []
-        ext = '.%s' % (self.extension,)
-        extlen = len(ext)
-        for rootdir in self.rootdirs:
-            for base, dirs, files in os.walk(rootdir, followlinks=True):
-                base = os.path.relpath(base, rootdir)
-                if base == '.':
-                    base = ''
-                else:
-                    base = base + '/'
-                for filename in files:
-                    if filename[-extlen:] != ext:
-                        continue
-                    path = base + filename
-                    if path in found:
-                        continue
-                    found.append(path)
-                    yield path
+        yield from self.scanner.paths(self.extension)
 
     def load(self, path):
         file = self._find_file(path)
@@ -137,7 +296,41 @@ class FileSystemLoader(Loader):
             return True, file
         raise TemplateNotFound(path)
 
+    def load_buffer(self, path):
+        file = self._find_file(path)
+        if not file:
+            raise TemplateNotFound(path)
+        try:
+            with open(file, 'rb') as fp:
+                stat = os.fstat(fp.fileno())
+                if self.mmap_threshold is None or \
+                        stat.st_size < max(self.mmap_threshold, 1):
+                    return fp.read()
+                key = (file, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+                buffer = self._mmaps.get(key)
+                if buffer is None:
+                    buffer = memoryview(mmap.mmap(
+                        fp.fileno(), 0, access=mmap.ACCESS_READ))
+                    self._mmaps.put(key, buffer)
+                return buffer
+        except FileNotFoundError:
+            raise TemplateNotFound(path)
+
     def _find_file(self, path):
+        if self.check_interval == 0:
+            return self._resolve(path)
+        now = time.monotonic()
+        cached = self._resolved.get(path)
+        if cached is not None:
+            file, checked = cached
+            if self.check_interval is None or \
+                    now - checked < self.check_interval:
+                return file
+        file = self._resolve(path)
+        self._resolved.put(path, (file, now))
+        return file
+
+    def _resolve(self, path):
         for rootdir in self.rootdirs:
             fullpath = os.path.join(rootdir, path.lstrip('/'))
             relpath = os.path.relpath(fullpath, rootdir)
@@ -159,28 +352,164 @@ class ChainLoader(Loader):
 
     def __init__(self, loaders):
         self.loaders = loaders
+        self._routes = ((), {})
+        self._index = ((), None)
 
     def is_valid(self, path):
-        return any(loader.is_valid(path) for loader in self.loaders)
+        return self._route(path) is not None
+
+    def path_index(self):
+        # the union of the indexes of all wrapped loaders, if all of them
+        # provide one
+        indexes = tuple(loader.path_index()
+                        if isinstance(loader, Loader) else None
+                        for loader in self.loaders)
+        if any(index is None for index in indexes):
+            return None
+        cached_indexes, index = self._index
+        if len(cached_indexes) != len(indexes) or \
+                any(a is not b for a, b in zip(cached_indexes, indexes)):
+            index = frozenset().union(*indexes)
+            self._index = (indexes, index)
+        return index
 
     def iter_paths(self):
         for loader in self.loaders:
             yield from loader.iter_paths()
 
     def load(self, path):
-        for loader in self.loaders:
-            try:
-                return loader.load(path)
-            except TemplateNotFound:
-                pass
-        raise TemplateNotFound(path)
+        loader = self._route(path)
+        if loader is None:
+            raise TemplateNotFound(path)
+        return loader.load(path)
 
     def hash(self, path):
-        for loader in self.loaders:
-            try:
-                return loader.hash(path)
-            except TemplateNotFound:
-                pass
+        loader = self._route(path)
+        if loader is None:
+            raise TemplateNotFound(path)
+        return loader.hash(path)
+
+    def _route(self, path):
+        """
+        Provides the first loader, that is capable of loading given *path*.
+        Paths are looked up in a mapping built from the :meth:`path_index` of
+        all wrapped loaders. Loaders with a custom :meth:`is_valid`
+        implementation, that might accept paths missing in their index, are
+        asked explicitly.
+        """
+        loaders = tuple(self.loaders)
+        indexes = tuple(loader.path_index()
+                        if isinstance(loader, Loader) else None
+                        for loader in loaders)
+        routed_indexes, routes = self._routes
+        if len(routed_indexes) != len(indexes) or \
+                any(a is not b for a, b in zip(routed_indexes, indexes)):
+            routes = {}
+            for position in reversed(range(len(loaders))):
+                for indexed_path in indexes[position] or ():
+                    routes[indexed_path] = position
+            self._routes = (indexes, routes)
+        end = routes.get(path, len(loaders))
+        for position in range(end):
+            loader = loaders[position]
+            if indexes[position] is not None and \
+                    type(loader).is_valid is Loader.is_valid:
+                # index is authoritative and does not contain the path
+                continue
+            if loader.is_valid(path):
+                return loader
+        if end < len(loaders):
+            return loaders[end]
+        return None
+
+
+class ArchiveLoader(Loader):
+    """
+    A :class:`Loader` serving templates from a zip or an uncompressed tar
+    *archive*. The archive is opened once and all requests are answered from
+    an index of its members. If an *extension* is given, only files with
+    that extension are provided. The contents of the templates are decoded
+    using given *encoding*.
+
+    The hashes of zip members are derived from their stored CRC and size,
+    without reading the contents. Tar archives store no such information,
+    so their members are hashed once, when first requested.
+
+    Call :meth:`reload` after replacing the archive.
+    """
+
+    def __init__(self, archive, extension=None, *, encoding='UTF-8'):
+        self.archive = archive
+        self.extension = extension
+        self.encoding = encoding
+        self._lock = threading.Lock()
+        self._hashes = {}
+        self._file = None
+        self.reload()
+
+    def reload(self):
+        """
+        Re-opens the archive and rebuilds the index of its members.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._hashes = {}
+            if zipfile.is_zipfile(self.archive):
+                self._file = zipfile.ZipFile(self.archive)
+                members = ((info.filename, info)
+                           for info in self._file.infolist()
+                           if not info.is_dir())
+            else:
+                self._file = tarfile.open(self.archive, mode='r:')
+                members = ((info.name, info)
+                           for info in self._file.getmembers()
+                           if info.isfile())
+            ext = '.%s' % (self.extension,)
+            self._members = {}
+            for name, info in members:
+                while name.startswith('./'):
+                    name = name[2:]
+                if self.extension and not name.endswith(ext):
+                    continue
+                self._members.setdefault(name.lstrip('/'), info)
+            self._index = frozenset(self._members)
+
+    def iter_paths(self):
+        yield from self._members
+
+    def path_index(self):
+        return self._index
+
+    def load(self, path):
+        return False, self._read(path).decode(self.encoding)
+
+    def load_buffer(self, path):
+        return self._read(path)
+
+    def hash(self, path):
+        info = self._info(path)
+        if isinstance(info, zipfile.ZipInfo):
+            return '%08x%x' % (info.CRC, info.file_size)
+        try:
+            return self._hashes[info.name]
+        except KeyError:
+            digest = self._hash_bytes(self._read(path))
+            self._hashes[info.name] = digest
+            return digest
+
+    def _info(self, path):
+        try:
+            return self._members[path.lstrip('/')]
+        except KeyError:
+            raise TemplateNotFound(path)
+
+    def _read(self, path):
+        info = self._info(path)
+        with self._lock:
+            if isinstance(info, zipfile.ZipInfo):
+                return self._file.read(info)
+            return self._file.extractfile(info).read()
 
 
 class PrefixedLoader(Loader):
@@ -198,10 +527,23 @@ class PrefixedLoader(Loader):
     def __init__(self, prefix, wrapped):
         self.prefix = prefix
         self.wrapped = wrapped
+        self._index = (None, None)
 
     def iter_paths(self):
         yield from (self.prefix + path for path in self.wrapped.iter_paths())
 
+    def path_index(self):
+        if not isinstance(self.wrapped, Loader):
+            return None
+        wrapped_index = self.wrapped.path_index()
+        if wrapped_index is None:
+            return None
+        cached_index, index = self._index
+        if cached_index is not wrapped_index:
+            index = frozenset(self.prefix + path for path in wrapped_index)
+            self._index = (wrapped_index, index)
+        return index
+
     def load(self, path):
         if not path.startswith(self.prefix):
             raise TemplateNotFound(path)
@@ -216,3 +558,10 @@ class PrefixedLoader(Loader):
         if not path.startswith(self.prefix):
             raise TemplateNotFound(path)
         return self.wrapped.hash(path[len(self.prefix):])
+
+
+async def _run_in_executor(executor, func, *args, **kwargs):
+    loop = asyncio.get_event_loop()
+    if kwargs:
+        func = functools.partial(func, **kwargs)
+    return await loop.run_in_executor(executor, func, *args)
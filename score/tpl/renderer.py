@@ -25,6 +25,7 @@
 # the discretion of STRG.AT GmbH also the competent court, in whose district
 # the Licensee has his registered seat, an establishment or assets.
 
+from .loader import _run_in_executor
 from abc import ABCMeta, abstractmethod
 
 
@@ -36,9 +37,13 @@ class Renderer(metaclass=ABCMeta):
 
     def render_file(self, file, variables, path=None):
         """
-        Renders given template *file* with the given *variables* dict.
+        Renders given template *file* with the given *variables* dict. The
+        file is read in the :attr:`encoding <FileType.encoding>` of this
+        renderer's file type.
         """
-        return self.render_string(open(file).read(), variables, path=path)
+        with open(file, encoding=self.filetype.encoding) as fp:
+            string = fp.read()
+        return self.render_string(string, variables, path=path)
 
     @abstractmethod
     def render_string(self, string, variables, path=None):
@@ -47,3 +52,129 @@ class Renderer(metaclass=ABCMeta):
         dict.
         """
         return
+
+    def iter_file(self, file, variables, path=None):
+        """
+        Renders given template *file* like :meth:`render_file`, but provides
+        an iterable of output chunks. Renderers capable of producing their
+        output incrementally should override :meth:`iter_string`, which
+        receives the contents of the file in the default implementation.
+        """
+        with open(file, encoding=self.filetype.encoding) as fp:
+            string = fp.read()
+        yield from self.iter_string(string, variables, path=path)
+
+    def iter_string(self, string, variables, path=None):
+        """
+        Renders given template content *string* like :meth:`render_string`,
+        but provides an iterable of output chunks. The default implementation
+        yields the result of :meth:`render_string` as a single chunk.
+        """
+        yield self.render_string(string, variables, path=path)
+
+    def render_file_bytes(self, file, variables, path=None):
+        """
+        Renders given template *file* like :meth:`render_file`, but provides
+        the result as `bytes` in the :attr:`encoding <FileType.encoding>` of
+        this renderer's file type. Renderers capable of producing encoded
+        output directly should override :meth:`render_string_bytes` and
+        :meth:`render_compiled_bytes`. The former receives the contents of
+        the file in the default implementation, unless :meth:`render_file`
+        was overridden.
+        """
+        if type(self).render_file is not Renderer.render_file:
+            return self.render_file(file, variables, path=path).encode(
+                self.filetype.encoding)
+        with open(file, encoding=self.filetype.encoding) as fp:
+            string = fp.read()
+        return self.render_string_bytes(string, variables, path=path)
+
+    def render_string_bytes(self, string, variables, path=None):
+        """
+        Renders given template content *string* like :meth:`render_string`,
+        but provides the encoded result. See :meth:`render_file_bytes`.
+        """
+        return self.render_string(string, variables, path=path).encode(
+            self.filetype.encoding)
+
+    async def render_file_async(self, file, variables, path=None, *,
+                                executor=None):
+        """
+        Coroutine variant of :meth:`render_file`. The default implementation
+        runs :meth:`render_file` in given :class:`executor
+        <concurrent.futures.Executor>` to keep file operations off the event
+        loop.
+        """
+        return await _run_in_executor(
+            executor, self.render_file, file, variables, path=path)
+
+    async def render_string_async(self, string, variables, path=None, *,
+                                  executor=None):
+        """
+        Coroutine variant of :meth:`render_string`. The default implementation
+        just calls :meth:`render_string`, as there is nothing to gain from
+        moving pure computations into a thread.
+        """
+        return self.render_string(string, variables, path=path)
+
+    def add_dependency(self, path, dependency):
+        """
+        Records that the template *path* includes, extends or imports the
+        template *dependency*. Renderers should call this function for every
+        such template, while compiling or rendering *path*, to allow the
+        configured module to invalidate cached results, whenever any of
+        these templates change. See
+        :meth:`ConfiguredTplModule.dependency_hash`.
+        """
+        self._tpl_conf.add_dependency(path, dependency)
+
+    def compile(self, string, path=None):
+        """
+        Parses the given template content *string* into an object, that can be
+        passed to :meth:`render_compiled` any number of times. The configured
+        module caches these objects, so renderers supporting this step will
+        only need to parse each template once.
+
+        The default implementation returns `None`, indicating that this
+        renderer does not support compilation.
+        """
+        return None
+
+    def render_compiled(self, compiled, variables, path=None):
+        """
+        Renders a *compiled* object, as returned by :meth:`compile`, with the
+        given *variables* dict.
+        """
+        raise NotImplementedError()
+
+    def render_compiled_bytes(self, compiled, variables, path=None):
+        """
+        Renders a *compiled* object like :meth:`render_compiled`, but provides
+        the encoded result. See :meth:`render_file_bytes`.
+        """
+        return self.render_compiled(compiled, variables, path=path).encode(
+            self.filetype.encoding)
+
+    def serialize(self, compiled):
+        """
+        Converts a *compiled* object, as returned by :meth:`compile`, into
+        `bytes`, which can be stored in a :class:`SharedCache` or a bundle.
+        The default implementation returns `None`, indicating that compiled
+        objects of this renderer cannot be serialized.
+        """
+        return None
+
+    def deserialize(self, data, path=None):
+        """
+        Restores a compiled object from the bytes-like *data* created by
+        :meth:`serialize`.
+        """
+        raise NotImplementedError()
+
+    def iter_compiled(self, compiled, variables, path=None):
+        """
+        Renders a *compiled* object like :meth:`render_compiled`, but provides
+        an iterable of output chunks. The default implementation yields the
+        result of :meth:`render_compiled` as a single chunk.
+        """
+        yield self.render_compiled(compiled, variables, path=path)
@@ -62,6 +62,6 @@ setup(
     ],
     install_requires=[
         'score.init >= 0.3.8',
-        'xxhash',
+        'xxhash >= 2.0',
     ],
 )
@@ -0,0 +1,56 @@
+from score.tpl import init, ArchiveLoader, TemplateNotFound
+import io
+import pytest
+import tarfile
+import zipfile
+
+
+FILES = {
+    'a.tpl': 'a',
+    'sub/b.tpl': 'ä',
+    'c.txt': 'c',
+}
+
+
+def _zip(tmp_path):
+    file = str(tmp_path / 'templates.zip')
+    with zipfile.ZipFile(file, 'w') as archive:
+        for name, content in FILES.items():
+            archive.writestr(name, content)
+    return file
+
+
+def _tar(tmp_path):
+    file = str(tmp_path / 'templates.tar')
+    with tarfile.open(file, 'w:') as archive:
+        for name, content in FILES.items():
+            data = content.encode('UTF-8')
+            info = tarfile.TarInfo('./' + name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return file
+
+
+@pytest.mark.parametrize('create', [_zip, _tar])
+def test_archive(tmp_path, create):
+    loader = ArchiveLoader(create(tmp_path), 'tpl')
+    assert set(loader.iter_paths()) == {'a.tpl', 'sub/b.tpl'}
+    assert loader.is_valid('sub/b.tpl')
+    assert not loader.is_valid('c.txt')
+    assert loader.load('sub/b.tpl') == (False, 'ä')
+    assert loader.load_buffer('a.tpl') == b'a'
+    assert loader.hash('a.tpl') == loader.hash('a.tpl')
+    assert loader.hash('a.tpl') != loader.hash('sub/b.tpl')
+    with pytest.raises(TemplateNotFound):
+        loader.load('c.txt')
+    with pytest.raises(TemplateNotFound):
+        loader.hash('missing.tpl')
+
+
+def test_rendering(tmp_path):
+    tpl = init({})
+    tpl.loaders['tpl'].append(ArchiveLoader(_zip(tmp_path), 'tpl'))
+    tpl.filetypes['text/plain'].extensions.append('tpl')
+    tpl._finalize()
+    assert tpl.render('sub/b.tpl') == 'ä'
+    assert set(tpl.iter_paths()) == {'a.tpl', 'sub/b.tpl'}
@@ -0,0 +1,65 @@
+from score.tpl import init, TemplateNotFound
+import multiprocessing
+import os
+import pytest
+
+
+def factory():
+    # defined at module level, so that spawned workers can unpickle it
+    tpl = init({
+        'rootdirs': os.path.join(os.path.dirname(__file__), 'templates')
+    })
+    tpl.filetypes['text/plain'].extensions.append('tpl')
+    tpl.filetypes['text/plain'].postprocessors.append(lambda a: a + 'foo')
+    tpl._finalize()
+    return tpl
+
+
+def test_ordered():
+    tpl = factory()
+    jobs = [('a.tpl', {}), ('b.tpl', None)] * 10
+    results = list(tpl.render_many(jobs, workers=2))
+    assert [r.index for r in results] == list(range(20))
+    assert [r.content for r in results] == ['a\nfoo', 'b\nfoo'] * 10
+    assert all(r.error is None for r in results)
+
+
+def test_unordered():
+    tpl = factory()
+    jobs = [('a.tpl', {}), ('b.tpl', None)] * 10
+    results = list(tpl.render_many(jobs, workers=2, ordered=False))
+    assert sorted(r.index for r in results) == list(range(20))
+    for result in results:
+        assert result.content == jobs[result.index][0][0] + '\nfoo'
+
+
+def test_errors():
+    tpl = factory()
+    jobs = [('a.tpl', {}), ('missing.tpl', {}), ('b.tpl', {})]
+    results = list(tpl.render_many(jobs, workers=2))
+    assert results[0].content == 'a\nfoo'
+    assert results[1].content is None
+    assert isinstance(results[1].error, TemplateNotFound)
+    assert results[2].content == 'b\nfoo'
+
+
+def test_factory():
+    tpl = factory()
+    results = list(tpl.render_many(
+        [('a.tpl', {})], workers=1, factory=factory))
+    assert results[0].content == 'a\nfoo'
+
+
+def test_no_fork(monkeypatch):
+    tpl = factory()
+    monkeypatch.setattr(
+        multiprocessing, 'get_all_start_methods', lambda: ['spawn'])
+    with pytest.raises(ValueError):
+        list(tpl.render_many([('a.tpl', {})]))
+
+
+def test_abandoned():
+    tpl = factory()
+    results = tpl.render_many([('a.tpl', {})] * 100, workers=1)
+    assert next(results).content == 'a\nfoo'
+    results.close()
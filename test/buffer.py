@@ -0,0 +1,51 @@
+from score.tpl import init
+from score.tpl.loader import FileSystemLoader
+import unittest.mock
+
+
+def test_small_file(tmp_path):
+    (tmp_path / 'a.txt').write_bytes(b'small')
+    loader = FileSystemLoader(str(tmp_path), 'txt', mmap_threshold=10)
+    assert loader.load_buffer('a.txt') == b'small'
+
+
+def test_mmap(tmp_path):
+    (tmp_path / 'a.txt').write_bytes(b'x' * 100)
+    loader = FileSystemLoader(str(tmp_path), 'txt', mmap_threshold=10)
+    buffer = loader.load_buffer('a.txt')
+    assert isinstance(buffer, memoryview)
+    assert bytes(buffer) == b'x' * 100
+    assert loader.load_buffer('a.txt') is buffer
+
+
+def test_render_buffer(tmp_path):
+    (tmp_path / 'a.txt').write_bytes('ä'.encode('UTF-8') * 100)
+    tpl = init({
+        'rootdirs': str(tmp_path),
+        'mmap_threshold': '10',
+    })
+    tpl.filetypes['text/plain'].extensions.append('txt')
+    tpl.filetypes['text/css'].extensions.append('css')
+    tpl.filetypes['text/css'].postprocessors.append(lambda a: a.upper())
+    tpl._finalize()
+    buffer = tpl.render_buffer('a.txt')
+    assert isinstance(buffer, memoryview)
+    assert bytes(buffer) == 'ä'.encode('UTF-8') * 100
+    (tmp_path / 'a.css').write_text('a')
+    assert tpl.render_buffer('a.css') == b'A'
+    assert tpl.render_buffer('a.css', apply_postprocessors=False) == b'a'
+
+
+def test_render_buffer_moved_template(tmp_path):
+    (tmp_path / 'a.txt').write_text('a')
+    tpl = init({'rootdirs': str(tmp_path)})
+    fallback = unittest.mock.Mock()
+    fallback.load.return_value = (False, 'from-fallback')
+    tpl.loaders['txt'].append(fallback)
+    tpl.filetypes['text/plain'].extensions.append('txt')
+    tpl._finalize()
+    assert bytes(tpl.render_buffer('a.txt')) == b'a'
+    (tmp_path / 'a.txt').unlink()
+    assert bytes(tpl.render_buffer('a.txt')) == b'from-fallback'
+    assert bytes(tpl.render_buffer('a.txt')) == b'from-fallback'
+    assert tpl.render('a.txt') == 'from-fallback'
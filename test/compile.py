@@ -0,0 +1,54 @@
+from .conftest import CompilingRenderer
+
+
+def test_compile_once(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a')
+    tpl = make_tpl(tmp_path, CompilingRenderer)
+    tpl._finalize()
+    CompilingRenderer.compilations = 0
+    assert tpl.render('a.tpl') == 'A'
+    assert tpl.render('a.tpl', {'suffix': '!'}) == 'A!'
+    assert CompilingRenderer.compilations == 1
+
+
+def test_recompile_on_change(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a')
+    tpl = make_tpl(tmp_path, CompilingRenderer)
+    tpl._finalize()
+    CompilingRenderer.compilations = 0
+    assert tpl.render('a.tpl') == 'A'
+    (tmp_path / 'a.tpl').write_text('b')
+    assert tpl.render('a.tpl') == 'B'
+    assert CompilingRenderer.compilations == 2
+
+
+def test_memory_budget(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a' * 10)
+    (tmp_path / 'b.tpl').write_text('b' * 10)
+    tpl = make_tpl(tmp_path, CompilingRenderer, **{
+        'cache.compiled.bytes': '15',
+    })
+    tpl._finalize()
+    CompilingRenderer.compilations = 0
+    tpl.render('a.tpl')
+    tpl.render('b.tpl')
+    tpl.render('b.tpl')
+    assert CompilingRenderer.compilations == 2
+    tpl.render('a.tpl')
+    assert CompilingRenderer.compilations == 3
+
+
+def test_warmup(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a')
+    (tmp_path / 'b.tpl').write_text('b')
+    (tmp_path / 'c.txt').write_text('c')
+    tpl = make_tpl(tmp_path, CompilingRenderer)
+    tpl.filetypes['text/x-text'].extensions.append('txt')
+    tpl._finalize()
+    CompilingRenderer.compilations = 0
+    assert tpl.warmup(workers=2) == 3
+    assert CompilingRenderer.compilations == 2
+    assert tpl.render('a.tpl') == 'A'
+    assert tpl.render('b.tpl') == 'B'
+    assert CompilingRenderer.compilations == 2
+    assert tpl.warmup('text/x-text') == 1
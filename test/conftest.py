@@ -0,0 +1,41 @@
+from score.tpl import init, Renderer
+import os
+import pytest
+
+
+TEMPLATES = os.path.join(os.path.dirname(__file__), 'templates')
+
+
+class UpperRenderer(Renderer):
+
+    def render_string(self, string, variables, path=None):
+        return string.upper()
+
+
+class CompilingRenderer(UpperRenderer):
+
+    compilations = 0
+
+    def compile(self, string, path=None):
+        CompilingRenderer.compilations += 1
+        return string.upper()
+
+    def render_compiled(self, compiled, variables, path=None):
+        return compiled + variables.get('suffix', '')
+
+
+@pytest.fixture
+def make_tpl():
+    """
+    Returns a factory for unfinalized tpl modules, that render files with the
+    extension 'tpl' as 'text/plain' using the given *engine*.
+    """
+    def make_tpl(rootdirs=TEMPLATES, engine=None, extensions=('tpl',),
+                 **conf):
+        conf['rootdirs'] = str(rootdirs)
+        tpl = init(conf)
+        if engine is not None:
+            tpl.engines['tpl'] = engine
+        tpl.filetypes['text/plain'].extensions.extend(extensions)
+        return tpl
+    return make_tpl
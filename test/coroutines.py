@@ -0,0 +1,61 @@
+from score.tpl import Loader
+from .conftest import UpperRenderer
+import asyncio
+import concurrent.futures
+import threading
+
+
+class AsyncLoader(Loader):
+
+    def iter_paths(self):
+        yield 'async.tpl'
+
+    def load(self, path):
+        raise AssertionError('blocking load() called')
+
+    async def load_async(self, path, *, executor=None):
+        return False, 'async'
+
+
+def test_render_async(make_tpl):
+    tpl = make_tpl()
+    tpl._finalize()
+    assert asyncio.run(tpl.render_async('a.tpl')) == 'a\n'
+    assert asyncio.run(tpl.load_async('a.tpl')) == tpl.load('a.tpl')
+    assert asyncio.run(tpl.hash_async('a.tpl')) == tpl.hash('a.tpl')
+
+
+def test_render_async_with_engine(make_tpl):
+    tpl = make_tpl(engine=UpperRenderer)
+    tpl._finalize()
+    assert asyncio.run(tpl.render_async('a.tpl')) == 'A\n'
+
+
+def test_native_async_loader(make_tpl):
+    tpl = make_tpl()
+    tpl.loaders['tpl'].insert(0, AsyncLoader())
+    tpl._finalize()
+    assert asyncio.run(tpl.render_async('async.tpl')) == 'async'
+
+
+def test_executor(make_tpl):
+    threads = set()
+
+    class ThreadRecordingLoader(Loader):
+
+        def iter_paths(self):
+            yield 'thread.tpl'
+
+        def load(self, path):
+            threads.add(threading.current_thread().name)
+            return False, 'thread'
+
+    executor = concurrent.futures.ThreadPoolExecutor(
+        thread_name_prefix='tpl-executor')
+    tpl = make_tpl()
+    tpl.executor = executor
+    tpl.loaders['tpl'].insert(0, ThreadRecordingLoader())
+    tpl._finalize()
+    assert asyncio.run(tpl.render_async('thread.tpl')) == 'thread'
+    assert all(name.startswith('tpl-executor') for name in threads)
+    executor.shutdown()
@@ -0,0 +1,153 @@
+from score.tpl import Renderer
+import pytest
+
+
+class IncludingRenderer(Renderer):
+    """
+    Replaces lines of the form 'include:<path>' with the rendered template.
+    """
+
+    compilations = 0
+
+    def render_string(self, string, variables, path=None):
+        compiled = self.compile(string, path)
+        return self.render_compiled(compiled, variables, path)
+
+    def compile(self, string, path=None):
+        IncludingRenderer.compilations += 1
+        lines = string.splitlines()
+        for line in lines:
+            if line.startswith('include:'):
+                self.add_dependency(path, line[8:])
+        return lines
+
+    def render_compiled(self, compiled, variables, path=None):
+        return '\n'.join(
+            self._tpl_conf.render(line[8:]) if line.startswith('include:')
+            else line
+            for line in compiled)
+
+
+class InterpretingRenderer(IncludingRenderer):
+    """
+    Like IncludingRenderer, but resolves the includes while rendering.
+    """
+
+    compile = Renderer.compile
+
+    def render_string(self, string, variables, path=None):
+        compiled = IncludingRenderer.compile(self, string, path)
+        return self.render_compiled(compiled, variables, path)
+
+
+def test_dependencies(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a\ninclude:b.tpl')
+    (tmp_path / 'b.tpl').write_text('b\ninclude:c.tpl')
+    (tmp_path / 'c.tpl').write_text('c')
+    tpl = make_tpl(tmp_path, IncludingRenderer)
+    tpl._finalize()
+    assert tpl.render('a.tpl') == 'a\nb\nc'
+    assert tpl.dependencies('a.tpl') == {'b.tpl', 'c.tpl'}
+    assert tpl.dependencies('c.tpl') == set()
+    assert tpl.dependents('c.tpl') == {'a.tpl', 'b.tpl'}
+    assert tpl.dependency_hash('c.tpl') == tpl.hash('c.tpl')
+    assert tpl.dependency_hash('a.tpl') != tpl.hash('a.tpl')
+
+
+def test_dependency_hash_changes(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a\ninclude:b.tpl')
+    (tmp_path / 'b.tpl').write_text('b')
+    tpl = make_tpl(tmp_path, IncludingRenderer)
+    tpl._finalize()
+    tpl.render('a.tpl')
+    hash = tpl.dependency_hash('a.tpl')
+    (tmp_path / 'b.tpl').write_text('B')
+    assert tpl.dependency_hash('a.tpl') != hash
+
+
+def test_recompile_on_dependency_change(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a\ninclude:b.tpl')
+    (tmp_path / 'b.tpl').write_text('b')
+    (tmp_path / 'c.tpl').write_text('c')
+    tpl = make_tpl(tmp_path, IncludingRenderer)
+    tpl._finalize()
+    IncludingRenderer.compilations = 0
+    tpl.render('a.tpl')
+    tpl.render('c.tpl')
+    assert IncludingRenderer.compilations == 3
+    (tmp_path / 'b.tpl').write_text('B')
+    assert tpl.render('a.tpl') == 'a\nB'
+    assert tpl.render('c.tpl') == 'c'
+    assert IncludingRenderer.compilations == 5
+
+
+def test_output_cache(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a\ninclude:b.tpl')
+    (tmp_path / 'b.tpl').write_text('b')
+    tpl = make_tpl(tmp_path, IncludingRenderer)
+    tpl._finalize()
+    tpl.mark_cacheable('a.tpl')
+    assert tpl.render('a.tpl') == 'a\nb'
+    (tmp_path / 'b.tpl').write_text('B')
+    assert tpl.render('a.tpl') == 'a\nB'
+
+
+def test_invalidate_dependents(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a\ninclude:b.tpl')
+    (tmp_path / 'b.tpl').write_text('b')
+    (tmp_path / 'c.tpl').write_text('c')
+    tpl = make_tpl(tmp_path, IncludingRenderer)
+    tpl._finalize()
+    IncludingRenderer.compilations = 0
+    tpl.render('a.tpl')
+    tpl.render('c.tpl')
+    assert IncludingRenderer.compilations == 3
+    tpl.invalidate('b.tpl')
+    tpl.render('a.tpl')
+    tpl.render('c.tpl')
+    assert IncludingRenderer.compilations == 5
+
+
+def test_dependency_removed(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a\ninclude:b.tpl')
+    (tmp_path / 'b.tpl').write_text('b')
+    tpl = make_tpl(tmp_path, IncludingRenderer)
+    tpl._finalize()
+    tpl.render('a.tpl')
+    (tmp_path / 'a.tpl').write_text('a')
+    tpl.render('a.tpl')
+    assert tpl.dependencies('a.tpl') == set()
+    assert tpl.dependents('b.tpl') == set()
+
+
+@pytest.mark.parametrize('renderer', [IncludingRenderer, InterpretingRenderer])
+def test_render_conditional(tmp_path, make_tpl, renderer):
+    (tmp_path / 'a.tpl').write_text('a\ninclude:b.tpl')
+    (tmp_path / 'b.tpl').write_text('b')
+    tpl = make_tpl(tmp_path, renderer)
+    tpl._finalize()
+    etag, content = tpl.render_conditional('a.tpl')
+    assert content == 'a\nb'
+    assert tpl.render_conditional('a.tpl', if_none_match=etag) == (etag, None)
+    (tmp_path / 'b.tpl').write_text('B')
+    tpl = make_tpl(tmp_path, renderer)
+    tpl._finalize()
+    changed, content = tpl.render_conditional('a.tpl', if_none_match=etag)
+    assert changed != etag
+    assert content == 'a\nB'
+    assert tpl.render_conditional('a.tpl', if_none_match=changed) == (
+        changed, None)
+
+
+def test_render_conditional_new_dependency(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a\ninclude:b.tpl')
+    (tmp_path / 'b.tpl').write_text('b')
+    (tmp_path / 'c.tpl').write_text('c')
+    tpl = make_tpl(tmp_path, InterpretingRenderer)
+    tpl._finalize()
+    etag, _ = tpl.render_conditional('a.tpl')
+    (tmp_path / 'b.tpl').write_text('b\ninclude:c.tpl')
+    changed, content = tpl.render_conditional('a.tpl', if_none_match=etag)
+    assert content == 'a\nb\nc'
+    assert tpl.render_conditional('a.tpl', if_none_match=changed) == (
+        changed, None)
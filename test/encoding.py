@@ -0,0 +1,115 @@
+from score.tpl import Renderer
+from score.tpl.loader import Loader
+from .conftest import CompilingRenderer, UpperRenderer
+import unittest.mock
+
+
+class BytesRenderer(Renderer):
+
+    def render_string(self, string, variables, path=None):
+        return string.upper()
+
+    def render_string_bytes(self, string, variables, path=None):
+        return b'<' + string.upper().encode(self.filetype.encoding) + b'>'
+
+
+def test_render_bytes(tmp_path, make_tpl):
+    (tmp_path / 'a.txt').write_bytes('ä'.encode('ISO-8859-1'))
+    (tmp_path / 'b.tpl').write_bytes('ö'.encode('ISO-8859-1'))
+    tpl = make_tpl(tmp_path, UpperRenderer, extensions=('txt', 'tpl'))
+    tpl.filetypes['text/plain'].encoding = 'ISO-8859-1'
+    tpl._finalize()
+    assert tpl.render_bytes('a.txt') == 'ä'.encode('ISO-8859-1')
+    assert tpl.render_bytes('b.tpl') == 'Ö'.encode('ISO-8859-1')
+    assert tpl.render_buffer('b.tpl') == 'Ö'.encode('ISO-8859-1')
+    assert tpl.render('b.tpl') == 'Ö'
+
+
+def test_file_encoding(tmp_path, make_tpl):
+    (tmp_path / 'a.txt').write_bytes('ä'.encode('ISO-8859-1'))
+    (tmp_path / 'b.tpl').write_bytes('ö'.encode('ISO-8859-1'))
+    tpl = make_tpl(tmp_path, UpperRenderer, extensions=('txt', 'tpl'))
+    tpl.filetypes['text/plain'].encoding = 'ISO-8859-1'
+    tpl._finalize()
+    assert tpl.render('b.tpl') == 'Ö'
+    assert list(tpl.render_iter('b.tpl')) == ['Ö']
+    tpl = make_tpl(tmp_path, CompilingRenderer)
+    tpl.filetypes['text/plain'].encoding = 'ISO-8859-1'
+    tpl._finalize()
+    assert tpl.render('b.tpl') == 'Ö'
+    assert tpl.render_bytes('b.tpl') == 'Ö'.encode('ISO-8859-1')
+
+
+def test_encoding_conf(make_tpl):
+    tpl = make_tpl(**{
+        'filetype.css.mimetype': 'text/css',
+        'filetype.css.encoding': 'UTF-16-LE',
+    })
+    assert tpl.filetypes['text/css'].encoding == 'UTF-16-LE'
+    assert tpl.filetypes['text/html'].encoding == 'UTF-8'
+
+
+def test_bytes_renderer(tmp_path, make_tpl):
+    (tmp_path / 'a.txt').write_bytes('ä'.encode('ISO-8859-1'))
+    (tmp_path / 'b.tpl').write_bytes('ö'.encode('ISO-8859-1'))
+    tpl = make_tpl(tmp_path, BytesRenderer, extensions=('txt', 'tpl'))
+    tpl.filetypes['text/plain'].encoding = 'ISO-8859-1'
+    tpl._finalize()
+    assert tpl.render_bytes('b.tpl') == b'<' + 'Ö'.encode('ISO-8859-1') + b'>'
+    assert tpl.render('b.tpl') == 'Ö'
+
+
+def test_bytes_postprocessor(tmp_path, make_tpl):
+    def exclaim(content):
+        assert isinstance(content, bytes)
+        return content + b'!'
+    exclaim.bytes = True
+    (tmp_path / 'a.txt').write_bytes('ä'.encode('ISO-8859-1'))
+    (tmp_path / 'b.tpl').write_bytes('ö'.encode('ISO-8859-1'))
+    tpl = make_tpl(tmp_path, UpperRenderer, extensions=('txt', 'tpl'))
+    tpl.filetypes['text/plain'].encoding = 'ISO-8859-1'
+    tpl.filetypes['text/plain'].postprocessors.append(exclaim)
+    tpl.filetypes['text/plain'].postprocessors.append(lambda a: a + '?')
+    tpl._finalize()
+    assert tpl.render_bytes('b.tpl') == 'Ö!?'.encode('ISO-8859-1')
+    assert tpl.render('b.tpl') == 'Ö!?'
+    assert list(tpl.render_iter('b.tpl')) == ['Ö!?']
+
+
+def test_cached_output(tmp_path, make_tpl):
+    (tmp_path / 'a.txt').write_bytes('ä'.encode('ISO-8859-1'))
+    (tmp_path / 'b.tpl').write_bytes('ö'.encode('ISO-8859-1'))
+    tpl = make_tpl(tmp_path, UpperRenderer, extensions=('txt', 'tpl'))
+    tpl.filetypes['text/plain'].encoding = 'ISO-8859-1'
+    tpl.filetypes['text/plain'].cacheable = True
+    tpl._finalize()
+    assert tpl.render_bytes('b.tpl') == 'Ö'.encode('ISO-8859-1')
+    with unittest.mock.patch.object(UpperRenderer, 'render_string') as render:
+        assert tpl.render_bytes('b.tpl') == 'Ö'.encode('ISO-8859-1')
+        render.assert_not_called()
+
+
+def test_precompute(tmp_path, make_tpl):
+    (tmp_path / 'a.txt').write_bytes('ä'.encode('ISO-8859-1'))
+    (tmp_path / 'b.tpl').write_bytes('ö'.encode('ISO-8859-1'))
+    tpl = make_tpl(tmp_path, UpperRenderer, extensions=('txt', 'tpl'),
+                   precompute='true')
+    tpl.filetypes['text/plain'].encoding = 'ISO-8859-1'
+    tpl._finalize()
+    (tmp_path / 'a.txt').write_text('changed')
+    assert tpl.render_bytes('a.txt') == 'ä'.encode('ISO-8859-1')
+    assert tpl.render_buffer('a.txt') == 'ä'.encode('ISO-8859-1')
+    assert tpl.precomputed('a.txt') == tpl.render('a.txt')
+
+
+class StringLoader(Loader):
+
+    def iter_paths(self):
+        yield 'a.txt'
+
+    def load(self, path):
+        return False, 'ä'
+
+
+def test_hash_unicode_content():
+    assert StringLoader().hash('a.txt')
@@ -0,0 +1,66 @@
+from score.tpl import Renderer
+import pytest
+
+
+class ContextRenderer(Renderer):
+
+    def render_string(self, string, variables, path=None):
+        context = self.filetype.context(variables)
+        return ' '.join(str(context[name]) for name in string.split())
+
+
+def test_global_mapping(make_tpl):
+    tpl = make_tpl(engine=ContextRenderer)
+    tpl.filetypes['text/plain'].add_global('a', 1)
+    tpl._finalize()
+    mapping = tpl.filetypes['text/plain'].global_mapping
+    assert mapping == {'a': 1}
+    assert tpl.filetypes['text/plain'].global_mapping is mapping
+    with pytest.raises(TypeError):
+        mapping['a'] = 2
+
+
+def test_context(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a b')
+    tpl = make_tpl(tmp_path, ContextRenderer)
+    tpl.filetypes['text/plain'].add_global('a', 1)
+    tpl.filetypes['text/plain'].add_global('b', 2)
+    tpl._finalize()
+    variables = {'b': 3}
+    context = tpl.filetypes['text/plain'].context(variables)
+    assert context['a'] == 1
+    assert context['b'] == 3
+    assert 'a' in context
+    assert 'c' not in context
+    assert sorted(context) == ['a', 'b']
+    assert len(context) == 2
+    assert dict(context) == {'a': 1, 'b': 3}
+    assert variables == {'b': 3}
+    assert tpl.render('a.tpl') == '1 2'
+    assert tpl.render('a.tpl', {'a': 'x'}) == 'x 2'
+
+
+def test_lazy_global(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a b')
+    (tmp_path / 'b.tpl').write_text('a lazy lazy')
+    tpl = make_tpl(tmp_path, ContextRenderer)
+    calls = []
+
+    def compute():
+        calls.append(None)
+        return 'computed'
+
+    tpl.filetypes['text/plain'].add_global('a', 1)
+    tpl.filetypes['text/plain'].add_global('lazy', compute, lazy=True)
+    tpl._finalize()
+    assert tpl.render('a.tpl', {'b': 2}) == '1 2'
+    assert calls == []
+    assert tpl.render('b.tpl') == '1 computed computed'
+    assert len(calls) == 1
+    assert tpl.render('b.tpl') == '1 computed computed'
+    assert len(calls) == 2
+    assert tpl.render('b.tpl', {'lazy': 'given'}) == '1 given given'
+    assert len(calls) == 2
+    assert [tuple(var) for var in tpl.filetypes['text/plain'].globals] == [
+        ('a', 1, True),
+    ]
@@ -0,0 +1,91 @@
+from score.tpl import init, TemplateIndex
+import os
+import unittest.mock
+
+
+def test_iter_files(tmp_path):
+    root = tmp_path / 'root'
+    (root / 'sub').mkdir(parents=True)
+    (root / 'a.tpl').write_text('a')
+    (root / 'sub' / 'b.tpl').write_text('bb')
+    index = TemplateIndex(str(tmp_path / 'index.json'))
+    files = {path: size for path, mtime, size in index.iter_files(str(root))}
+    assert files == {'a.tpl': 1, 'sub/b.tpl': 2}
+    assert (tmp_path / 'index.json').exists()
+
+
+def test_persistence(tmp_path):
+    root = tmp_path / 'root'
+    (root / 'sub').mkdir(parents=True)
+    (root / 'a.tpl').write_text('a')
+    (root / 'sub' / 'b.tpl').write_text('b')
+    TemplateIndex(str(tmp_path / 'index.json')).iter_files(str(root))
+    index = TemplateIndex(str(tmp_path / 'index.json'))
+    with unittest.mock.patch('os.scandir') as scandir:
+        paths = [path for path, *_ in index.iter_files(str(root))]
+        scandir.assert_not_called()
+    assert sorted(paths) == ['a.tpl', 'sub/b.tpl']
+
+
+def test_rescan_changed_folders(tmp_path):
+    root = tmp_path / 'root'
+    (root / 'sub').mkdir(parents=True)
+    (root / 'other').mkdir(parents=True)
+    (root / 'a.tpl').write_text('a')
+    index = TemplateIndex(str(tmp_path / 'index.json'))
+    index.iter_files(str(root))
+    (root / 'sub' / 'b.tpl').write_text('b')
+    with unittest.mock.patch('os.scandir', wraps=os.scandir) as scandir:
+        paths = [path for path, *_ in index.iter_files(str(root))]
+        scandir.assert_called_once_with(os.path.join(str(root), 'sub/'))
+    assert sorted(paths) == ['a.tpl', 'sub/b.tpl']
+
+
+def test_conf(tmp_path):
+    tpl = init({
+        'rootdirs': os.path.join(os.path.dirname(__file__), 'templates'),
+        'index_file': str(tmp_path / 'index.json'),
+    })
+    tpl.filetypes['text/plain'].extensions.append('tpl')
+    tpl._finalize()
+    assert set(tpl.iter_paths()) == {'a.tpl', 'b.tpl', 'empty.tpl'}
+    assert (tmp_path / 'index.json').exists()
+
+
+def test_single_scan(tmp_path):
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'a.tpl').write_text('a')
+    (tmp_path / 'sub' / 'b.tpl.xml').write_text('b')
+    (tmp_path / 'c.css').write_text('c')
+    tpl = init({'rootdirs': str(tmp_path)})
+    tpl.filetypes['text/plain'].extensions.append('tpl')
+    tpl.filetypes['text/xml'].extensions.append('xml')
+    tpl.filetypes['application/xml'].extensions.append('tpl.xml')
+    tpl.filetypes['text/css'].extensions.append('css')
+    tpl._finalize()
+    with unittest.mock.patch('os.scandir', wraps=os.scandir) as scandir:
+        paths = list(tpl.iter_paths())
+        assert scandir.call_count == 2
+    assert sorted(paths) == ['a.tpl', 'c.css', 'sub/b.tpl.xml']
+
+
+def test_symlinks(tmp_path):
+    root = tmp_path / 'root'
+    (root / 'real').mkdir(parents=True)
+    (root / 'real' / 'a.tpl').write_text('a')
+    (root / 'alias').symlink_to(root / 'real')
+    (root / 'real' / 'loop').symlink_to(root)
+    index = TemplateIndex(str(tmp_path / 'index.json'))
+    paths = [path for path, *_ in index.iter_files(str(root))]
+    assert sorted(paths) == ['alias/a.tpl', 'real/a.tpl']
+
+
+def test_scanner_symlinks(tmp_path):
+    (tmp_path / 'real').mkdir()
+    (tmp_path / 'real' / 'a.tpl').write_text('a')
+    (tmp_path / 'alias').symlink_to(tmp_path / 'real')
+    (tmp_path / 'real' / 'loop').symlink_to(tmp_path)
+    tpl = init({'rootdirs': str(tmp_path)})
+    tpl.filetypes['text/plain'].extensions.append('tpl')
+    tpl._finalize()
+    assert sorted(tpl.iter_paths()) == ['alias/a.tpl', 'real/a.tpl']
@@ -1,8 +1,11 @@
+from score.init import ConfigurationError
 from score.tpl import init, TemplateNotFound
-from score.tpl.loader import FileSystemLoader
+from score.tpl.loader import (
+    Loader, FileSystemLoader, ChainLoader, PrefixedLoader)
 import os
 import pytest
 import unittest.mock
+import xxhash
 
 
 def test_filesystem_loader_existence():
@@ -72,3 +75,173 @@ def test_secondary_mimetype():
     assert tpl.render('a.tpl.ext') == 'a\n'
     assert 'a.tpl.ext' in tpl.iter_paths('text/plain')
     assert 'a.tpl.ext' not in tpl.iter_paths('text/css')
+
+
+def test_filesystem_loader_check_interval(tmp_path):
+    loader = FileSystemLoader(str(tmp_path), 'tpl', check_interval=None)
+    assert not loader.is_valid('new.tpl')
+    (tmp_path / 'new.tpl').write_text('new')
+    assert not loader.is_valid('new.tpl')
+    loader = FileSystemLoader(str(tmp_path), 'tpl', check_interval=0)
+    assert loader.is_valid('new.tpl')
+    (tmp_path / 'new.tpl').unlink()
+    assert not loader.is_valid('new.tpl')
+
+
+def test_check_interval_conf(tmp_path):
+    (tmp_path / 'a.tpl').write_text('a')
+    tpl = init({
+        'rootdirs': str(tmp_path),
+        'check_interval': 'never',
+    })
+    tpl.filetypes['text/plain'].extensions.append('tpl')
+    tpl._finalize()
+    assert tpl.render('a.tpl') == 'a'
+    assert tpl.render('a.tpl') == 'a'
+    with pytest.raises(TemplateNotFound):
+        tpl.render('c.tpl')
+    (tmp_path / 'c.tpl').write_text('c')
+    with pytest.raises(TemplateNotFound):
+        tpl.render('c.tpl')
+
+
+def test_hash_cache(tmp_path):
+    file = tmp_path / 'a.tpl'
+    file.write_text('a')
+    loader = FileSystemLoader(str(tmp_path), 'tpl')
+    first = loader.hash('a.tpl')
+    with unittest.mock.patch('builtins.open') as open_:
+        assert loader.hash('a.tpl') == first
+        open_.assert_not_called()
+    assert loader.hash_cache.hits == 1
+    assert loader.hash_cache.misses == 1
+    file.write_text('changed')
+    assert loader.hash('a.tpl') != first
+    assert loader.hash_cache.misses == 2
+
+
+class DictLoader(Loader):
+
+    def __init__(self, templates):
+        self.templates = templates
+        self.enumerations = 0
+
+    def iter_paths(self):
+        self.enumerations += 1
+        yield from self.templates
+
+    def load(self, path):
+        if path not in self.templates:
+            raise TemplateNotFound(path)
+        return False, self.templates[path]
+
+
+def test_path_index():
+    loader = DictLoader({'a.tpl': 'a', 'b.tpl': 'b'})
+    assert loader.is_valid('a.tpl')
+    assert not loader.is_valid('c.tpl')
+    assert loader.path_index() == {'a.tpl', 'b.tpl'}
+    assert loader.enumerations == 1
+
+
+def test_chain_loader_routing(tmp_path):
+    (tmp_path / 'a.tpl').write_text('file')
+    first = DictLoader({'a.tpl': 'first', 'b.tpl': 'first'})
+    second = DictLoader({'b.tpl': 'second', 'c.tpl': 'second'})
+    files = FileSystemLoader(str(tmp_path), 'tpl')
+    loader = ChainLoader([files, first, second])
+    assert loader.load('a.tpl') == (True, str(tmp_path / 'a.tpl'))
+    assert loader.load('b.tpl') == (False, 'first')
+    assert loader.load('c.tpl') == (False, 'second')
+    assert loader.hash('c.tpl') == second.hash('c.tpl')
+    assert not loader.is_valid('d.tpl')
+    with pytest.raises(TemplateNotFound):
+        loader.hash('d.tpl')
+    assert first.enumerations == 1
+    assert second.enumerations == 1
+
+
+def test_content_hash_cache():
+    loader = DictLoader({'a.tpl': 'a'})
+    first = loader.hash('a.tpl')
+    assert loader.hash('a.tpl') == first
+    assert loader.hash_cache.hits == 1
+    loader.templates['a.tpl'] = 'ä'
+    assert loader.hash('a.tpl') != first
+    assert len(loader.hash_cache) == 1
+
+
+def test_wrapper_path_index(tmp_path):
+    (tmp_path / 'a.tpl').write_text('a')
+    files = FileSystemLoader(str(tmp_path), 'tpl')
+    loader = ChainLoader([PrefixedLoader('p/', files), files])
+    with unittest.mock.patch.object(files.scanner, 'paths') as paths:
+        assert loader.is_valid('p/a.tpl')
+        assert loader.is_valid('a.tpl')
+        assert not loader.is_valid('b.tpl')
+        paths.assert_not_called()
+    assert loader.path_index() is None
+    first = DictLoader({'a.tpl': 'a'})
+    second = DictLoader({'b.tpl': 'b'})
+    prefixed = PrefixedLoader('p/', first)
+    assert prefixed.path_index() == {'p/a.tpl'}
+    assert prefixed.path_index() is prefixed.path_index()
+    loader = ChainLoader([prefixed, second])
+    assert loader.path_index() == {'p/a.tpl', 'b.tpl'}
+    assert loader.path_index() is loader.path_index()
+    assert first.enumerations == 1
+
+
+def test_validating_loader_in_chain():
+
+    class ValidatingLoader(Loader):
+
+        def is_valid(self, path):
+            return path == 'x.tpl'
+
+        def load(self, path):
+            if path != 'x.tpl':
+                raise TemplateNotFound(path)
+            return False, 'x'
+
+    loader = ChainLoader([ValidatingLoader()])
+    assert loader.path_index() is None
+    assert loader.is_valid('x.tpl')
+    assert loader.load('x.tpl') == (False, 'x')
+    assert not loader.is_valid('y.tpl')
+
+
+def test_hash_algorithm(tmp_path):
+    (tmp_path / 'a.tpl').write_text('a')
+    (tmp_path / 'empty.tpl').write_text('')
+    loader = FileSystemLoader(str(tmp_path), 'tpl')
+    assert loader.hash('a.tpl') == xxhash.xxh64(b'a').hexdigest()
+    assert loader.hash('empty.tpl') == xxhash.xxh64(b'').hexdigest()
+    loader = FileSystemLoader(str(tmp_path), 'tpl', hash_algorithm='xxh3_128')
+    assert loader.hash('a.tpl') == xxhash.xxh3_128(b'a').hexdigest()
+    assert loader.hash('empty.tpl') == xxhash.xxh3_128(b'').hexdigest()
+
+
+def test_hash_algorithm_conf(tmp_path):
+    (tmp_path / 'a.txt').write_text('a')
+    tpl = init({'rootdirs': str(tmp_path), 'hash_algorithm': 'xxh3_64'})
+    tpl.filetypes['text/plain'].extensions.append('txt')
+    tpl._finalize()
+    assert tpl.hash('a.txt') == xxhash.xxh3_64(b'a').hexdigest()
+    with pytest.raises(ConfigurationError):
+        init({'rootdirs': str(tmp_path), 'hash_algorithm': 'md5'})
+
+
+def test_hash_many(tmp_path):
+    (tmp_path / 'a.txt').write_text('a')
+    (tmp_path / 'b.txt').write_text('b')
+    tpl = init({'rootdirs': str(tmp_path)})
+    tpl.filetypes['text/plain'].extensions.append('txt')
+    tpl._finalize()
+    assert tpl.hash_many(workers=2) == {
+        'a.txt': tpl.hash('a.txt'),
+        'b.txt': tpl.hash('b.txt'),
+    }
+    assert tpl.hash_many(['b.txt']) == {'b.txt': tpl.hash('b.txt')}
+    with pytest.raises(TemplateNotFound):
+        tpl.hash_many(['c.txt'])
@@ -0,0 +1,159 @@
+from score.tpl import Renderer
+import asyncio
+import time
+
+
+class CountingRenderer(Renderer):
+
+    renderings = 0
+
+    def render_string(self, string, variables, path=None):
+        CountingRenderer.renderings += 1
+        return string + variables.get('suffix', '')
+
+
+def test_not_cacheable(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a')
+    tpl = make_tpl(tmp_path, CountingRenderer)
+    tpl._finalize()
+    CountingRenderer.renderings = 0
+    tpl.render('a.tpl')
+    tpl.render('a.tpl')
+    assert CountingRenderer.renderings == 2
+
+
+def test_cached(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a')
+    tpl = make_tpl(tmp_path, CountingRenderer)
+    tpl.filetypes['text/plain'].cacheable = True
+    tpl._finalize()
+    CountingRenderer.renderings = 0
+    assert tpl.render('a.tpl') == 'a'
+    assert tpl.render('a.tpl', {}) == 'a'
+    assert CountingRenderer.renderings == 1
+    assert tpl.render('a.tpl', {'suffix': '!'}) == 'a!'
+    assert tpl.render('a.tpl', {'suffix': '!'}) == 'a!'
+    assert CountingRenderer.renderings == 2
+
+
+def test_unfingerprintable_variables(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a')
+    tpl = make_tpl(tmp_path, CountingRenderer)
+    tpl.filetypes['text/plain'].cacheable = True
+    tpl._finalize()
+    CountingRenderer.renderings = 0
+    tpl.render('a.tpl', {'suffix': '', 'obj': object()})
+    tpl.render('a.tpl', {'suffix': '', 'obj': object()})
+    assert CountingRenderer.renderings == 2
+
+
+def test_fingerprint_types(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a')
+    tpl = make_tpl(tmp_path, CountingRenderer)
+    tpl.filetypes['text/plain'].cacheable = True
+    tpl._finalize()
+    CountingRenderer.renderings = 0
+    tpl.render('a.tpl', {'suffix': '', 'items': [1]})
+    tpl.render('a.tpl', {'suffix': '', 'items': (1,)})
+    assert CountingRenderer.renderings == 2
+    tpl.render('a.tpl', {'suffix': '', 'map': {1: 'x'}})
+    tpl.render('a.tpl', {'suffix': '', 'map': {1: 'x'}})
+    assert CountingRenderer.renderings == 4
+
+
+def test_cached_async(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a')
+    tpl = make_tpl(tmp_path, CountingRenderer)
+    tpl.filetypes['text/plain'].cacheable = True
+    tpl._finalize()
+    CountingRenderer.renderings = 0
+    assert tpl.render('a.tpl') == 'a'
+    assert asyncio.run(tpl.render_async('a.tpl')) == 'a'
+    assert CountingRenderer.renderings == 1
+
+
+def test_cached_iter(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a')
+    tpl = make_tpl(tmp_path, CountingRenderer)
+    tpl.filetypes['text/plain'].cacheable = True
+    tpl._finalize()
+    CountingRenderer.renderings = 0
+    assert ''.join(tpl.render_iter('a.tpl', {'suffix': '!'})) == 'a!'
+    assert tpl.render('a.tpl', {'suffix': '!'}) == 'a!'
+    assert ''.join(tpl.render_iter('a.tpl', {'suffix': '!'})) == 'a!'
+    assert CountingRenderer.renderings == 1
+
+
+def test_template_change(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a')
+    tpl = make_tpl(tmp_path, CountingRenderer)
+    tpl.filetypes['text/plain'].cacheable = True
+    tpl._finalize()
+    assert tpl.render('a.tpl') == 'a'
+    (tmp_path / 'a.tpl').write_text('b')
+    assert tpl.render('a.tpl') == 'b'
+
+
+def test_ttl(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a')
+    tpl = make_tpl(tmp_path, CountingRenderer)
+    tpl.filetypes['text/plain'].cacheable = True
+    tpl.filetypes['text/plain'].cache_ttl = 0.01
+    tpl._finalize()
+    CountingRenderer.renderings = 0
+    tpl.render('a.tpl')
+    time.sleep(0.02)
+    tpl.render('a.tpl')
+    assert CountingRenderer.renderings == 2
+
+
+def test_mark_cacheable(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a')
+    tpl = make_tpl(tmp_path, CountingRenderer)
+    tpl._finalize()
+    CountingRenderer.renderings = 0
+    tpl.mark_cacheable('a.tpl')
+    tpl.render('a.tpl')
+    tpl.render('a.tpl')
+    assert CountingRenderer.renderings == 1
+    tpl.invalidate('a.tpl')
+    tpl.render('a.tpl')
+    assert CountingRenderer.renderings == 2
+
+
+def test_render_conditional(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a')
+    tpl = make_tpl(tmp_path, CountingRenderer)
+    tpl._finalize()
+    CountingRenderer.renderings = 0
+    etag, content = tpl.render_conditional('a.tpl', {'suffix': '!'})
+    assert content == 'a!'
+    assert CountingRenderer.renderings == 1
+    assert tpl.render_conditional(
+        'a.tpl', {'suffix': '!'}, if_none_match=etag) == (etag, None)
+    assert tpl.render_conditional(
+        'a.tpl', {'suffix': '!'},
+        if_none_match='"other", W/%s' % etag) == (etag, None)
+    assert CountingRenderer.renderings == 1
+    other, content = tpl.render_conditional(
+        'a.tpl', {'suffix': '?'}, if_none_match=etag)
+    assert other != etag
+    assert content == 'a?'
+    (tmp_path / 'a.tpl').write_text('b')
+    changed, content = tpl.render_conditional(
+        'a.tpl', {'suffix': '!'}, if_none_match=etag)
+    assert changed != etag
+    assert content == 'b!'
+
+
+def test_render_conditional_fingerprint(tmp_path, make_tpl):
+    (tmp_path / 'a.tpl').write_text('a')
+    tpl = make_tpl(tmp_path, CountingRenderer)
+    tpl._finalize()
+    etag, _ = tpl.render_conditional('a.tpl', {'obj': object()},
+                                     fingerprint='v1')
+    assert etag is not None
+    assert tpl.render_conditional('a.tpl', {'obj': object()},
+                                  fingerprint='v1',
+                                  if_none_match=etag) == (etag, None)
+    assert tpl.render_conditional('a.tpl', {'obj': object()}) == (None, 'a')
@@ -31,3 +31,24 @@ def test_removing_postprocessor():
     tpl.filetypes['text/plain'].postprocessors.pop()
     tpl._finalize()
     assert tpl.render('a.tpl') == 'a\n'
+
+
+def test_pure_postprocessor():
+    calls = []
+
+    def postprocessor(content):
+        calls.append(content)
+        return content + 'foo'
+    postprocessor.pure = True
+    tpl = init({
+        'rootdirs': os.path.join(os.path.dirname(__file__), 'templates')
+    })
+    tpl.filetypes['text/plain'].extensions.append('tpl')
+    tpl.filetypes['text/plain'].postprocessors.append(postprocessor)
+    tpl._finalize()
+    assert tpl.render('a.tpl') == 'a\nfoo'
+    assert tpl.render('a.tpl') == 'a\nfoo'
+    assert tpl.render('b.tpl') == 'b\nfoo'
+    assert calls == ['a\n', 'b\n']
+    cache = tpl.filetypes['text/plain'].postprocessor_cache
+    assert (cache.hits, cache.misses) == (1, 2)
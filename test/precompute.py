@@ -0,0 +1,60 @@
+from .conftest import UpperRenderer
+import asyncio
+import unittest.mock
+
+
+def exclaim(content):
+    return content + '!'
+
+
+def test_precompute(tmp_path, make_tpl):
+    (tmp_path / 'a.txt').write_text('a')
+    (tmp_path / 'b.tpl').write_text('b')
+    tpl = make_tpl(tmp_path, UpperRenderer, extensions=('txt', 'tpl'))
+    tpl.filetypes['text/plain'].postprocessors.append(exclaim)
+    tpl._finalize()
+    tpl.precompute()
+    assert tpl.precomputed('a.txt') == 'a!'
+    assert tpl.precomputed('b.tpl') is None
+    (tmp_path / 'a.txt').write_text('changed')
+    with unittest.mock.patch('builtins.open') as open_:
+        assert tpl.render('a.txt') == 'a!'
+        open_.assert_not_called()
+    assert tpl.render('a.txt', apply_postprocessors=False) == 'changed'
+    tpl.invalidate('a.txt')
+    assert tpl.render('a.txt') == 'changed!'
+    assert tpl.render('b.tpl') == 'B!'
+
+
+def test_conf(tmp_path, make_tpl):
+    (tmp_path / 'a.txt').write_text('a')
+    tpl = make_tpl(tmp_path, extensions=('txt',), **{
+        'precompute': 'true',
+        'precompute.encoding': 'utf-8',
+    })
+    tpl.filetypes['text/plain'].postprocessors.append(exclaim)
+    tpl._finalize()
+    assert tpl.precomputed('a.txt') == b'a!'
+    assert tpl.render('a.txt') == 'a!'
+
+
+def test_all_render_paths(tmp_path, make_tpl):
+    (tmp_path / 'a.txt').write_text('a')
+    tpl = make_tpl(tmp_path, extensions=('txt',))
+    tpl.filetypes['text/plain'].postprocessors.append(exclaim)
+    tpl._finalize()
+    tpl.precompute()
+    (tmp_path / 'a.txt').write_text('changed')
+    assert tpl.render('a.txt') == 'a!'
+    assert asyncio.run(tpl.render_async('a.txt')) == 'a!'
+    assert ''.join(tpl.render_iter('a.txt')) == 'a!'
+
+
+def test_precompute_errors(tmp_path, make_tpl):
+    (tmp_path / 'a.txt').write_text('a')
+    (tmp_path / 'c.txt').write_bytes(b'\xff')
+    tpl = make_tpl(tmp_path, extensions=('txt',), precompute='true')
+    tpl.filetypes['text/plain'].postprocessors.append(exclaim)
+    tpl._finalize()
+    assert tpl.precomputed('a.txt') == 'a!'
+    assert tpl.precomputed('c.txt') is None
@@ -0,0 +1,85 @@
+from score.tpl import Renderer, SharedCache
+from .conftest import CompilingRenderer
+
+
+class SerializingRenderer(Renderer):
+
+    compilations = 0
+
+    def render_string(self, string, variables, path=None):
+        return string.upper()
+
+    def compile(self, string, path=None):
+        SerializingRenderer.compilations += 1
+        return string.upper()
+
+    def render_compiled(self, compiled, variables, path=None):
+        return compiled
+
+    def serialize(self, compiled):
+        return compiled.encode('UTF-8')
+
+    def deserialize(self, data, path=None):
+        return bytes(data).decode('UTF-8')
+
+
+def test_cache(tmp_path):
+    cache = SharedCache(str(tmp_path))
+    assert cache.get('ns', 'key') is None
+    cache.put('ns', 'key', b'value')
+    assert cache.get('ns', 'key') == b'value'
+    assert cache.get('other', 'key') is None
+    assert SharedCache(str(tmp_path)).get('ns', 'key') == b'value'
+    cache.clear()
+    assert cache.get('ns', 'key') is None
+
+
+def test_shared_compilation(tmp_path, make_tpl):
+    (tmp_path / 'templates').mkdir()
+    (tmp_path / 'templates' / 'a.tpl').write_text('a')
+    SerializingRenderer.compilations = 0
+    first = make_tpl(tmp_path / 'templates', SerializingRenderer, **{
+        'cache.shared': str(tmp_path / 'shared'),
+    })
+    first._finalize()
+    second = make_tpl(tmp_path / 'templates', SerializingRenderer, **{
+        'cache.shared': str(tmp_path / 'shared'),
+    })
+    second._finalize()
+    assert first.render('a.tpl') == 'A'
+    assert second.render('a.tpl') == 'A'
+    assert SerializingRenderer.compilations == 1
+    assert second.shared_cache.hits == 2
+    (tmp_path / 'templates' / 'a.tpl').write_text('b')
+    assert second.render('a.tpl') == 'B'
+    assert SerializingRenderer.compilations == 2
+
+
+def test_bundle(tmp_path, make_tpl):
+    (tmp_path / 'templates').mkdir()
+    (tmp_path / 'templates' / 'a.tpl').write_text('a')
+    (tmp_path / 'templates' / 'b.tpl').write_text('b')
+    bundle = str(tmp_path / 'templates.bundle')
+    tpl = make_tpl(tmp_path / 'templates', SerializingRenderer)
+    tpl._finalize()
+    assert tpl.build_bundle(bundle) == 2
+    (tmp_path / 'templates' / 'b.tpl').write_text('changed')
+    SerializingRenderer.compilations = 0
+    tpl = make_tpl(tmp_path / 'templates', SerializingRenderer,
+                   bundle=bundle)
+    tpl._finalize()
+    assert tpl.render('a.tpl') == 'A'
+    assert SerializingRenderer.compilations == 0
+    assert tpl.render('b.tpl') == 'CHANGED'
+    assert SerializingRenderer.compilations == 1
+
+
+def test_unserializable(tmp_path, make_tpl):
+    (tmp_path / 'templates').mkdir()
+    (tmp_path / 'templates' / 'a.tpl').write_text('a')
+    tpl = make_tpl(tmp_path / 'templates', CompilingRenderer, **{
+        'cache.shared': str(tmp_path / 'shared'),
+    })
+    tpl._finalize()
+    assert tpl.render('a.tpl') == 'A'
+    assert tpl.render('a.tpl') == 'A'
@@ -0,0 +1,52 @@
+from .conftest import UpperRenderer
+
+
+def leetify(content):
+    return content.replace('a', '4')
+
+
+def test_listener(make_tpl):
+    events = []
+    tpl = make_tpl(engine=UpperRenderer)
+    tpl.filetypes['text/plain'].postprocessors.append(leetify)
+    tpl._finalize()
+    tpl.add_listener(lambda *args: events.append(args))
+    tpl.render('a.tpl')
+    tpl.hash('a.tpl')
+    assert [(path, phase) for path, phase, _ in events] == [
+        ('a.tpl', 'resolve'),
+        ('a.tpl', 'load'),
+        ('a.tpl', 'renderer:UpperRenderer'),
+        ('a.tpl', 'postprocessor:leetify'),
+        ('a.tpl', 'render'),
+        ('a.tpl', 'hash'),
+    ]
+    assert all(duration >= 0 for *_, duration in events)
+
+
+def test_stats(make_tpl):
+    tpl = make_tpl(stats='true')
+    tpl.filetypes['text/plain'].postprocessors.append(leetify)
+    tpl._finalize()
+    tpl.render('a.tpl')
+    tpl.render('a.tpl')
+    tpl.hash('a.tpl')
+    tpl.hash('a.tpl')
+    stats = tpl.stats()
+    assert stats['phases']['render']['count'] == 2
+    assert stats['phases']['read']['count'] == 2
+    assert stats['templates']['a.tpl']['count'] == 2
+    assert stats['templates']['a.tpl']['p50'] <= \
+        stats['templates']['a.tpl']['p99']
+    assert stats['caches']['templates']['hits'] == 1
+    assert stats['caches']['hashes']['ratio'] == 0.5
+
+
+def test_no_listeners(make_tpl):
+    tpl = make_tpl()
+    tpl.filetypes['text/plain'].postprocessors.append(leetify)
+    tpl._finalize()
+    tpl.render('a.tpl')
+    stats = tpl.stats()
+    assert 'phases' not in stats
+    assert stats['caches']['templates']['misses'] == 1
@@ -0,0 +1,60 @@
+from score.tpl import Renderer
+from .conftest import CompilingRenderer
+import io
+
+
+class ChunkRenderer(Renderer):
+
+    def render_string(self, string, variables, path=None):
+        return ''.join(self.iter_string(string, variables, path=path))
+
+    def iter_string(self, string, variables, path=None):
+        for char in string:
+            yield char
+
+
+def test_engineless(make_tpl):
+    tpl = make_tpl()
+    tpl._finalize()
+    assert list(tpl.render_iter('a.tpl')) == ['a\n']
+    assert list(tpl.render_iter('empty.tpl')) == []
+
+
+def test_streaming_renderer(make_tpl):
+    tpl = make_tpl(engine=ChunkRenderer)
+    tpl._finalize()
+    assert list(tpl.render_iter('a.tpl')) == ['a', '\n']
+    assert tpl.render('a.tpl') == 'a\n'
+
+
+def test_streaming_postprocessor(make_tpl):
+    def upper(chunks):
+        for chunk in chunks:
+            yield chunk.upper()
+    upper.streaming = True
+    tpl = make_tpl(engine=ChunkRenderer)
+    tpl.filetypes['text/plain'].postprocessors.append(upper)
+    tpl._finalize()
+    assert list(tpl.render_iter('a.tpl')) == ['A', '\n']
+    assert tpl.render('a.tpl') == 'A\n'
+
+
+def test_buffering_postprocessor(make_tpl):
+    tpl = make_tpl(engine=ChunkRenderer)
+    tpl.filetypes['text/plain'].postprocessors.append(lambda a: a + 'foo')
+    tpl._finalize()
+    assert list(tpl.render_iter('a.tpl')) == ['a\nfoo']
+
+
+def test_render_to(make_tpl):
+    tpl = make_tpl(engine=ChunkRenderer)
+    tpl._finalize()
+    file = io.StringIO()
+    tpl.render_to('a.tpl', {}, file)
+    assert file.getvalue() == 'a\n'
+
+
+def test_compiled(make_tpl):
+    tpl = make_tpl(engine=CompilingRenderer)
+    tpl._finalize()
+    assert list(tpl.render_iter('a.tpl')) == ['A\n']
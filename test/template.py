@@ -0,0 +1,81 @@
+from score.tpl import init, Template, TemplateNotFound
+import asyncio
+import os
+import pytest
+import unittest.mock
+
+
+def test_get():
+    tpl = init({
+        'rootdirs': os.path.join(os.path.dirname(__file__), 'templates')
+    })
+    tpl.filetypes['text/plain'].extensions.append('tpl')
+    tpl._finalize()
+    template = tpl.get('a.tpl')
+    assert isinstance(template, Template)
+    assert template.filetype == tpl.filetypes['text/plain']
+    assert template.render() == 'a\n'
+    assert template.hash() == tpl.hash('a.tpl')
+    assert tpl.get('a.tpl') is template
+
+
+def test_memoized_resolution():
+    tpl = init({
+        'rootdirs': os.path.join(os.path.dirname(__file__), 'templates')
+    })
+    tpl.filetypes['text/plain'].extensions.append('tpl')
+    tpl._finalize()
+    with unittest.mock.patch.object(
+            tpl, '_find_loader', wraps=tpl._find_loader) as find_loader:
+        assert tpl.render('a.tpl') == 'a\n'
+        assert tpl.render('a.tpl') == 'a\n'
+        find_loader.assert_called_once_with('a.tpl')
+
+
+def test_memo_size():
+    tpl = init({
+        'rootdirs': os.path.join(os.path.dirname(__file__), 'templates'),
+        'cache.templates': '1',
+    })
+    tpl.filetypes['text/plain'].extensions.append('tpl')
+    tpl._finalize()
+    template = tpl.get('a.tpl')
+    tpl.get('b.tpl')
+    assert tpl.get('a.tpl') is not template
+
+
+def test_vanished_template():
+    tpl = init({
+        'rootdirs': os.path.join(os.path.dirname(__file__), 'templates')
+    })
+    loader = unittest.mock.Mock()
+    loader.load.return_value = (False, 'foo')
+    tpl.loaders['tpl'].insert(0, loader)
+    tpl.filetypes['text/plain'].extensions.append('tpl')
+    tpl._finalize()
+    assert tpl.render('a.tpl') == 'foo'
+    loader.load.side_effect = TemplateNotFound
+    with pytest.raises(TemplateNotFound):
+        tpl.render('a.tpl')
+    loader.is_valid.return_value = False
+    assert tpl.render('a.tpl') == 'a\n'
+
+
+@pytest.mark.parametrize('render', [
+    lambda tpl: tpl.render('a.tpl'),
+    lambda tpl: tpl.render_bytes('a.tpl').decode('UTF-8'),
+    lambda tpl: ''.join(tpl.render_iter('a.tpl')),
+    lambda tpl: asyncio.run(tpl.render_async('a.tpl')),
+])
+def test_template_moved_to_other_loader(tmp_path, render):
+    (tmp_path / 'a.tpl').write_text('a')
+    tpl = init({'rootdirs': str(tmp_path)})
+    fallback = unittest.mock.Mock()
+    fallback.load.return_value = (False, 'from-fallback')
+    tpl.loaders['tpl'].append(fallback)
+    tpl.filetypes['text/plain'].extensions.append('tpl')
+    tpl._finalize()
+    assert render(tpl) == 'a'
+    (tmp_path / 'a.tpl').unlink()
+    assert render(tpl) == 'from-fallback'
+    assert render(tpl) == 'from-fallback'